@@ -5,17 +5,14 @@ Orchestrates all components and handles the scanning workflow
 """
 
 import sys
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
 from pathlib import Path
 from .core.config import ConfigManager
 from .ui.colors import print_banner, console
 from .ui.interface import UserInterface
 from .core.scanner_core import ScannerCore
-from .scanners import NmapScanner, WebScanners, DNSScanner, WordlistManager
 from .scanners.web_detection import WebDetector
-from .scanners.domain_manager import DomainManager
-from .scanners.param_lfi_scanner import ParameterLFIScanner
-from .scanners.cms_scanner import CMSScanner
 from .core.report_generator import ReportGenerator
 
 
@@ -55,13 +52,22 @@ class IPSnipeApp:
     
     def initialize_scanners(self):
         """Initialize scanner components after configuration is complete"""
+        # Imported here rather than at module level so the scanners package's
+        # lazy loading defers these modules (and their dependencies) until
+        # a scan is actually configured
+        from .scanners import (
+            NmapScanner, WebScanners, DNSScanner, ParameterLFIScanner,
+            CMSScanner, WordlistManager
+        )
+        from .scanners.domain_manager import DomainManager
+        
         self.scanner_core = ScannerCore(self.config, self.output_dir)
         self.nmap_scanner = NmapScanner(self.config, self.enhanced_mode)
         self.web_scanners = WebScanners(self.config)
         self.dns_scanner = DNSScanner(self.config)
         self.domain_manager = DomainManager(self.target_ip, self.enhanced_mode)
         self.param_lfi_scanner = ParameterLFIScanner(self.config)
-        self.cms_scanner = CMSScanner(self.config)
+        self.cms_scanner = CMSScanner(self.config, self.output_dir)
         self.report_generator = ReportGenerator(self.output_dir)
         self.wordlist_manager = WordlistManager(self.config, self.output_dir)
         
@@ -80,10 +86,25 @@ class IPSnipeApp:
             console.print("⚠️  Enhanced web scanner not available", style="yellow")
             self.enhanced_web_scanner = None
     
+    def _submit_cms_scan(self, executor: ThreadPoolExecutor):
+        """Start the CMS scan in the background and return its Future
+        
+        Its commands go through the background runners, which leave the
+        foreground scan's progress indicator and skip requests alone.
+        """
+        return self.cms_scanner.submit_comprehensive_cms_scan(
+            executor, self.target_ip, list(self.web_ports),
+            self.scanner_core.run_command_background, self.scanner_core.run_commands_background
+        )
+    
     def run_command(self, command: List[str], output_file: str, description: str, scan_type: str = "generic") -> Dict:
         """Delegate command execution to scanner core"""
         return self.scanner_core.run_command(command, output_file, description, scan_type)
     
+    def run_commands(self, jobs: List[Tuple[List[str], str, str, str]], max_workers: int = None) -> List[Dict]:
+        """Delegate concurrent command execution to scanner core"""
+        return self.scanner_core.run_commands_concurrent(jobs, max_workers)
+    
     def _auto_discover_web_ports_and_domains(self):
         """Auto-discover web ports and domains when no nmap scan has been run"""
         console.print("\n🔍 Web-only scan detected - performing automatic web port discovery", style="bold yellow")
@@ -170,9 +191,18 @@ class IPSnipeApp:
         domains_added_to_hosts = False
         first_nmap_completed = False
         
+        # The CMS scan runs in the background from the first web scan on, so
+        # it overlaps the other web scans instead of waiting for its turn
+        cms_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ipsnipe-cms')
+        cms_future = None
+        
         for attack in selected_attacks:
             current_scan_num += 1
             
+            if ('cms_scan' in selected_attacks and cms_future is None and self.web_ports and
+                    attack in ('enhanced_web', 'feroxbuster', 'ffuf', 'cms_scan', 'param_lfi_scan')):
+                cms_future = self._submit_cms_scan(cms_executor)
+            
             # Simple progress indicator
             console.print(f"\n[{current_scan_num}/{total_scans}] {attack.replace('_', ' ').title()}", style="bold", end=' ')
             
@@ -252,12 +282,13 @@ class IPSnipeApp:
                 
             elif attack == 'cms_scan':
                 # Auto-discover web ports if none found yet
-                if not self.web_ports:
-                    self._auto_discover_web_ports_and_domains()
+                if cms_future is None:
+                    if not self.web_ports:
+                        self._auto_discover_web_ports_and_domains()
+                    cms_future = self._submit_cms_scan(cms_executor)
                 
-                self.results[attack] = self.cms_scanner.comprehensive_cms_scan(
-                    self.target_ip, self.web_ports, self.run_command
-                )
+                # Collected once the remaining scans are done
+                self.results[attack] = {'status': 'running'}
                 
             elif attack == 'dns_enumeration':
                                 # DNS enumeration works best with discovered domains
@@ -400,9 +431,23 @@ class IPSnipeApp:
                     console.print("- Tool not found", style="red")
                 elif status == 'error':
                     console.print("- Error", style="red")
+                elif status == 'running':
+                    console.print("- Running in background", style="cyan")
                 else:
                     console.print(f"- {status}")
         
+        # Collect the background CMS scan (also after a quit - its commands
+        # stop as soon as they see the quit request)
+        if cms_future:
+            if not cms_future.done():
+                console.print("\n⏳ Waiting for the background CMS scan to finish...", style="cyan")
+            try:
+                self.results['cms_scan'] = cms_future.result()
+            except Exception as e:
+                self.results['cms_scan'] = {'status': 'error', 'error': str(e)}
+            console.print(f"CMS Scan - {self.results['cms_scan'].get('status')}", style="bold")
+        cms_executor.shutdown()
+        
         # Stop input monitoring
         if self.scanner_core:
             self.scanner_core.stop_input_monitor()
@@ -487,12 +532,19 @@ class IPSnipeApp:
         
         except KeyboardInterrupt:
             # Handle Ctrl+C gracefully
-            if self.scanner_core and self.scanner_core.current_process:
+            if self.scanner_core and self.scanner_core.active_processes:
                 console.print("\n🛑 Stopping current scan...", style="yellow")
-                self.scanner_core._terminate_process()
+                self.scanner_core.terminate_all_processes()
                 self.scanner_core.stop_input_monitor()
             console.print("\n👋 ipsnipe interrupted by user. Goodbye!", style="yellow")
             sys.exit(0)
         except Exception as e:
             console.print(f"\n❌ An error occurred: {str(e)}", style="red")
-            sys.exit(1) 
\ No newline at end of file
+            sys.exit(1)
+        finally:
+            # Also on Ctrl+C or an error: persist the DNS cache, stop the DNS
+            # log writer and release pooled connections
+            if getattr(self, 'advanced_dns_scanner', None):
+                self.advanced_dns_scanner.close()
+            if self.domain_manager:
+                self.domain_manager.close() 
\ No newline at end of file
@@ -14,8 +14,9 @@ import queue
 import signal
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from ..ui.colors import Colors
 from ..ui.progress import ScanProgressIndicator
 
@@ -28,6 +29,10 @@ class ScannerCore:
         self.output_dir = output_dir
         self.skip_current_scan = False
         self.current_process = None
+        self.active_processes = set()
+        self._process_lock = threading.Lock()
+        self.skip_event = threading.Event()
+        self.quit_event = threading.Event()
         self.input_queue = queue.Queue()
         self.input_thread = None
         self.instructions_shown = False
@@ -140,38 +145,151 @@ class ScannerCore:
         progress = ScanProgressIndicator(description, timeout)
         progress.start()
         
+        self.skip_event.clear()
+        self.quit_event.clear()
+        
+        return self._run_process(command, output_file, description, scan_type, progress, track_current=True)
+    
+    def run_commands_concurrent(self, jobs: List[Tuple[List[str], str, str, str]], max_workers: int = None) -> List[Dict]:
+        """Execute independent commands in parallel, returning results in job order
+        
+        Each job is a (command, output_file, description, scan_type) tuple. A single
+        progress indicator covers the whole batch; a skip or quit request applies
+        to every in-flight scan.
+        """
+        if not jobs:
+            return []
+        
+        if max_workers is None:
+            max_workers = self._available_cpus() * 2
+        max_workers = max(1, min(max_workers, len(jobs)))
+        
+        timeout = self.config['general']['scan_timeout']
+        description = f"{len(jobs)} concurrent scans"
+        
+        progress = ScanProgressIndicator(description, timeout)
+        progress.start()
+        
+        self.skip_event.clear()
+        self.quit_event.clear()
+        
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._run_process, command, output_file, job_description,
+                                scan_type, progress, shared_progress=True)
+                for command, output_file, job_description, scan_type in jobs
+            ]
+            results = [future.result() for future in futures]
+        
+        if self.quit_event.is_set():
+            progress.stop("quit")
+        elif self.skip_event.is_set():
+            progress.stop("skipped")
+        else:
+            progress.stop("completed", time.time() - start_time)
+        
+        return results
+    
+    def run_command_background(self, command: List[str], output_file: str, description: str,
+                               scan_type: str = "generic") -> Dict:
+        """Execute a command alongside the foreground scan
+        
+        No progress indicator of its own and the skip/quit events are left
+        alone, so it can't swallow a keypress meant for the foreground scan.
+        A skip only applies to the foreground scan; a quit stops this too.
+        """
+        progress = ScanProgressIndicator(description, self.config['general']['scan_timeout'])
+        return self._run_process(command, output_file, description, scan_type, progress,
+                                 shared_progress=True, background=True)
+    
+    def run_commands_background(self, jobs: List[Tuple[List[str], str, str, str]],
+                                max_workers: int = None) -> List[Dict]:
+        """Execute independent commands in parallel alongside the foreground scan
+        
+        The background counterpart of run_commands_concurrent; results come
+        back in job order.
+        """
+        if not jobs:
+            return []
+        
+        if max_workers is None:
+            max_workers = self._available_cpus() * 2
+        max_workers = max(1, min(max_workers, len(jobs)))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.run_command_background, *job) for job in jobs]
+            return [future.result() for future in futures]
+    
+    @staticmethod
+    def _available_cpus() -> int:
+        """Number of CPUs this process may run on"""
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
+    
+    def _run_process(self, command: List[str], output_file: str, description: str, scan_type: str,
+                     progress: ScanProgressIndicator, shared_progress: bool = False,
+                     track_current: bool = False, background: bool = False) -> Dict:
+        """Run one command to completion, honouring skip/quit requests and the scan timeout
+        
+        The Popen handle is kept local so several commands can run at once; only
+        the sequential path publishes it as self.current_process. Background
+        commands ignore skip requests, which belong to the foreground scan.
+        """
+        timeout = self.config['general']['scan_timeout']
         start_time = time.time()
         
+        def stop_progress(status: str, execution_time: float = None):
+            if not shared_progress:
+                progress.stop(status, execution_time)
+        
+        # Don't start new work once the user has asked to skip or quit
+        if self.quit_event.is_set():
+            return {'status': 'user_quit', 'output_file': output_file}
+        if self.skip_event.is_set() and not background:
+            return self._create_skip_report(output_file, description, start_time)
+        
+        process = None
         try:
             # Start the process
-            self.current_process = subprocess.Popen(
+            process = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
                 preexec_fn=os.setsid if hasattr(os, 'setsid') else None
             )
+            with self._process_lock:
+                self.active_processes.add(process)
+            if track_current:
+                self.current_process = process
             
             # Monitor process while checking for user input and progress indicator status
-            while self.current_process.poll() is None:
-                # Check if progress indicator detected skip/quit
+            while process.poll() is None:
+                # Propagate skip/quit detected by the progress indicator
                 if progress.skipped:
-                    final_status = progress.stop("skipped")
+                    self.skip_event.set()
+                elif progress.quit_requested:
+                    self.quit_event.set()
+                
+                if self.skip_event.is_set() and not background:
+                    stop_progress("skipped")
                     print(f"{Colors.YELLOW}⏭️  Skipping {description} at user request{Colors.END}")
-                    self._terminate_process()
+                    self._terminate_process(process)
                     return self._create_skip_report(output_file, description, start_time)
-                elif progress.quit_requested:
-                    final_status = progress.stop("quit")
+                elif self.quit_event.is_set():
+                    stop_progress("quit")
                     print(f"{Colors.YELLOW}🛑 User requested to quit all scans{Colors.END}")
-                    self._terminate_process()
+                    self._terminate_process(process)
                     return {'status': 'user_quit', 'output_file': output_file}
                 
                 # Check for timeout
                 elapsed = time.time() - start_time
                 if elapsed > timeout:
-                    progress.stop("timeout")
+                    stop_progress("timeout")
                     print(f"{Colors.RED}⏰ {description} timed out after {timeout//60} minutes{Colors.END}")
-                    self._terminate_process()
+                    self._terminate_process(process)
                     return self._create_timeout_report(output_file, description, timeout)
                 
                 time.sleep(0.1)  # Small delay to prevent excessive CPU usage
@@ -181,11 +299,11 @@ class ScannerCore:
             execution_time = end_time - start_time
             
             # Get output first
-            stdout, stderr = self.current_process.communicate()
-            return_code = self.current_process.returncode
+            stdout, stderr = process.communicate()
+            return_code = process.returncode
             
             # Stop progress indicator cleanly
-            final_status = progress.stop("completed", execution_time)
+            stop_progress("completed", execution_time)
             
             # Format the output content
             formatted_stdout = self.format_output_content(stdout, scan_type)
@@ -218,39 +336,52 @@ class ScannerCore:
                 }
                 
         except FileNotFoundError:
-            progress.stop("error")
+            stop_progress("error")
             print(f"{Colors.RED}❌ Command not found. Please ensure required tools are installed.{Colors.END}")
             return {'status': 'not_found', 'output_file': output_file}
         except Exception as e:
-            progress.stop("error")
+            stop_progress("error")
             print(f"{Colors.RED}❌ Error running {description}: {str(e)}{Colors.END}")
             return {'status': 'error', 'output_file': output_file, 'error': str(e)}
         finally:
-            self.current_process = None
+            if process is not None:
+                with self._process_lock:
+                    self.active_processes.discard(process)
+            if track_current:
+                self.current_process = None
     
-    def _terminate_process(self):
-        """Terminate the current process gracefully"""
-        if self.current_process:
+    def _terminate_process(self, process: subprocess.Popen = None):
+        """Terminate a running process gracefully (defaults to the current process)"""
+        process = process or self.current_process
+        if process:
             try:
                 # Try graceful termination first
                 if hasattr(os, 'killpg'):
-                    os.killpg(os.getpgid(self.current_process.pid), signal.SIGTERM)
+                    os.killpg(os.getpgid(process.pid), signal.SIGTERM)
                 else:
-                    self.current_process.terminate()
+                    process.terminate()
                 
                 # Wait a bit for graceful termination
                 try:
-                    self.current_process.wait(timeout=5)
+                    process.wait(timeout=5)
                 except subprocess.TimeoutExpired:
                     # Force kill if graceful termination didn't work
                     if hasattr(os, 'killpg'):
-                        os.killpg(os.getpgid(self.current_process.pid), signal.SIGKILL)
+                        os.killpg(os.getpgid(process.pid), signal.SIGKILL)
                     else:
-                        self.current_process.kill()
+                        process.kill()
             except (ProcessLookupError, OSError):
                 # Process already terminated
                 pass
     
+    def terminate_all_processes(self):
+        """Terminate every in-flight process, including concurrent scans"""
+        self.quit_event.set()
+        with self._process_lock:
+            processes = list(self.active_processes)
+        for process in processes:
+            self._terminate_process(process)
+    
     def _create_skip_report(self, output_file: str, description: str, start_time: float) -> Dict:
         """Create a report for a skipped scan"""
         output_path = Path(self.output_dir) / output_file
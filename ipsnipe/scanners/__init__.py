@@ -2,38 +2,58 @@
 """
 Scanner modules for ipsnipe
 Individual scanner implementations
+
+Scanner classes are loaded lazily (PEP 562) so that importing the package
+only pulls in the modules - and their dependencies - that are actually used.
 """
 
-from .nmap_scanner import NmapScanner
-from .web_scanners import WebScanners
-from .dns_scanner import DNSScanner
-from .web_detection import WebDetector
-from .param_lfi_scanner import ParameterLFIScanner
-from .cms_scanner import CMSScanner
-from .wordlist_manager import WordlistManager
-
-# Enhanced scanners (optional imports)
-try:
-    from .advanced_dns_scanner import AdvancedDNSScanner
-    ADVANCED_DNS_AVAILABLE = True
-except ImportError:
-    ADVANCED_DNS_AVAILABLE = False
-
-try:
-    from .enhanced_web_scanner import EnhancedWebScanner
-    ENHANCED_WEB_AVAILABLE = True
-except ImportError:
-    ENHANCED_WEB_AVAILABLE = False
+import importlib
+
+# Scanner class name -> module that defines it
+_LAZY = {
+    'NmapScanner': '.nmap_scanner',
+    'WebScanners': '.web_scanners',
+    'DNSScanner': '.dns_scanner',
+    'WebDetector': '.web_detection',
+    'ParameterLFIScanner': '.param_lfi_scanner',
+    'CMSScanner': '.cms_scanner',
+    'WordlistManager': '.wordlist_manager',
+    # Enhanced scanners (optional imports)
+    'AdvancedDNSScanner': '.advanced_dns_scanner',
+    'EnhancedWebScanner': '.enhanced_web_scanner',
+}
+
+# Availability flag -> optional scanner it reports on
+_AVAILABILITY_FLAGS = {
+    'ADVANCED_DNS_AVAILABLE': 'AdvancedDNSScanner',
+    'ENHANCED_WEB_AVAILABLE': 'EnhancedWebScanner',
+}
 
 __all__ = [
-    'NmapScanner', 'WebScanners', 'DNSScanner', 'WebDetector', 
+    'NmapScanner', 'WebScanners', 'DNSScanner', 'WebDetector',
     'ParameterLFIScanner', 'CMSScanner', 'WordlistManager',
     'ADVANCED_DNS_AVAILABLE', 'ENHANCED_WEB_AVAILABLE'
 ]
 
-# Conditionally add enhanced scanners if available
-if ADVANCED_DNS_AVAILABLE:
-    __all__.append('AdvancedDNSScanner')
-    
-if ENHANCED_WEB_AVAILABLE:
-    __all__.append('EnhancedWebScanner') 
\ No newline at end of file
+
+def __getattr__(name):
+    """Import scanner classes and availability flags on first access"""
+    if name in _LAZY:
+        module = importlib.import_module(_LAZY[name], __name__)
+        value = getattr(module, name)
+    elif name in _AVAILABILITY_FLAGS:
+        try:
+            __getattr__(_AVAILABILITY_FLAGS[name])
+            value = True
+        except ImportError:
+            value = False
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Cache on the module so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | set(_AVAILABILITY_FLAGS))
@@ -4,27 +4,171 @@ Advanced DNS scanner with comprehensive enumeration techniques
 Implements the most effective DNS discovery methods for HTB/CTF environments
 """
 
+import asyncio
 import subprocess
 import re
+import shutil
 import socket
 import threading
 import time
 import json
+import logging
+import queue
+import sys
+import uuid
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
 from typing import Dict, List, Set, Optional, Tuple
 from ..ui.colors import Colors
 
+# dnspython is optional - without it lookups fall back to the system resolver
+try:
+    import dns.asyncresolver
+    import dns.query
+    import dns.resolver
+    import dns.reversename
+    import dns.zone
+    DNSPYTHON_AVAILABLE = True
+except ImportError:
+    DNSPYTHON_AVAILABLE = False
+
+# ijson is optional - without it crt.sh responses are parsed in one go
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Progress output goes through a logger so worker threads only enqueue
+# records; a listener thread is the single writer to stdout. The queue
+# handler is attached once here; the listener thread only starts when an
+# enumeration actually runs (records logged before then wait in the queue).
+# Messages already carry their Colors codes, so they're printed verbatim
+logger = logging.getLogger('ipsnipe.dns')
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+_log_queue = queue.Queue()
+logger.addHandler(QueueHandler(_log_queue))
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(logging.Formatter('%(message)s'))
+_log_listener = QueueListener(_log_queue, _console_handler)
+_log_listener_lock = threading.Lock()
+_log_listener_running = False
+
+
+def _start_log_listener():
+    """Start the stdout writer thread if it isn't already running"""
+    global _log_listener_running
+    with _log_listener_lock:
+        if not _log_listener_running:
+            _log_listener.start()
+            _log_listener_running = True
+
+
+def _stop_log_listener():
+    """Write out every queued record and stop the writer thread"""
+    global _log_listener_running
+    with _log_listener_lock:
+        if _log_listener_running:
+            _log_listener.stop()
+            _log_listener_running = False
+
+# Generic domain name, used to pull hostnames out of record and tool output
+_DOMAIN_RE = re.compile(r'([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})')
+
+# Marks a brute-force lookup that was never sent because the run was aborted
+_SKIPPED = object()
+
+# Marks a lookup that got no usable answer (timeout, SERVFAIL, refused...);
+# unlike a negative answer it says nothing about the name, so isn't cached
+_UNANSWERED = object()
+
+
+class _FailureGuard:
+    """Trips once too many lookups in a row go unanswered within a short window
+    
+    Used to stop brute forcing a DNS server that has stopped responding
+    instead of waiting out a timeout for every remaining candidate.
+    """
+    
+    def __init__(self, limit: int = 20, window: float = 5.0):
+        self.limit = limit
+        self.window = window
+        self.tripped = threading.Event()
+        self._lock = threading.Lock()
+        self._count = 0
+        self._first_failure = 0.0
+    
+    def record(self, failed: bool):
+        """Count a lookup outcome; any answer resets the streak"""
+        with self._lock:
+            if not failed:
+                self._count = 0
+                return
+            
+            now = time.monotonic()
+            if self._count == 0 or now - self._first_failure > self.window:
+                self._count = 0
+                self._first_failure = now
+            self._count += 1
+            
+            if self._count > self.limit:
+                self.tripped.set()
+
+
+def _is_negative_answer(error: Exception) -> bool:
+    """True if a lookup error means the server answered that the name doesn't exist"""
+    if DNSPYTHON_AVAILABLE and isinstance(error, (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)):
+        return True
+    # EAI_AGAIN is the system resolver's "no answer in time"
+    return isinstance(error, socket.gaierror) and error.errno != socket.EAI_AGAIN
+
+
 class AdvancedDNSScanner:
     """Advanced DNS enumeration with multiple techniques"""
     
     def __init__(self, config: Dict):
         self.config = config
+        
         self.discovered_subdomains = set()
         self.discovered_ips = set()
         self.dns_records = {}
         self.certificate_domains = set()
         self.historical_domains = set()
         
+        # Resolution cache shared across runs: name -> (resolved_at, ip or None)
+        self.cache_ttl = self.config.get('advanced_dns', {}).get('cache_ttl', 300)
+        self.cache_file = Path.home() / '.ipsnipe' / 'dns_cache.json'
+        self._cache_lock = threading.Lock()
+        self._dns_cache = self._load_dns_cache()
+        
+        # Certificate transparency results per domain (in-memory only)
+        self._ct_cache = {}
+        
+        # External enumeration tools found on PATH, detected on first use
+        self._available_tools: Optional[Dict[str, bool]] = None
+        
+        # Keep-alive session shared by HTTP sources (crt.sh) across domains
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'ipsnipe/2.1 (DNS Scanner)'})
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10,
+                              max_retries=Retry(total=2, backoff_factor=0.3))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # In-process resolver with bounded per-query time (system resolver has none)
+        self.resolver = None
+        if DNSPYTHON_AVAILABLE:
+            try:
+                self.resolver = self._configure_resolver(dns.resolver.Resolver())
+            except Exception as e:
+                logger.warning(f"{Colors.YELLOW}⚠️  dnspython resolver unavailable, using system resolver: {e}{Colors.END}")
+        
         # HTB-optimized subdomain wordlist
         self.htb_subdomains = [
             'admin', 'api', 'www', 'mail', 'ftp', 'vpn', 'ssh', 'remote',
@@ -39,10 +183,20 @@ class AdvancedDNSScanner:
             'ns', 'ns1', 'ns2', 'dns', 'resolver',
             'proxy', 'gateway', 'firewall', 'router',
             'media', 'static', 'assets', 'cdn', 'img', 'images',
-            'mobile', 'app', 'api', 'm', 'wap',
-            'old', 'legacy', 'archive', 'backup', 'bak'
+            'mobile', 'm', 'wap',
+            'old', 'legacy', 'archive', 'bak'
         ]
     
+    def close(self):
+        """Release pooled HTTP connections, persist the DNS cache and stop logging"""
+        self.session.close()
+        self.save_dns_cache()
+        _stop_log_listener()
+    
+    def _flush_output(self):
+        """Block until every queued log message has been written to stdout"""
+        _log_queue.join()
+    
     def comprehensive_enumeration(self, target_ip: str, discovered_domains: List[str], run_command_func) -> Dict:
         """Run comprehensive DNS enumeration with multiple techniques"""
         results = {
@@ -54,78 +208,90 @@ class AdvancedDNSScanner:
             'tools_used': []
         }
         
-        print(f"\n{Colors.CYAN}🔍 Starting Advanced DNS Enumeration{Colors.END}")
-        print(f"{Colors.YELLOW}📋 Target IP: {target_ip}{Colors.END}")
-        print(f"{Colors.YELLOW}📋 Known Domains: {', '.join(discovered_domains)}{Colors.END}")
+        _start_log_listener()
+        logger.info(f"\n{Colors.CYAN}🔍 Starting Advanced DNS Enumeration{Colors.END}")
+        logger.info(f"{Colors.YELLOW}📋 Target IP: {target_ip}{Colors.END}")
+        logger.info(f"{Colors.YELLOW}📋 Known Domains: {', '.join(discovered_domains)}{Colors.END}")
         
         if not discovered_domains:
-            print(f"{Colors.YELLOW}⚠️  No domains available for enumeration{Colors.END}")
+            logger.warning(f"{Colors.YELLOW}⚠️  No domains available for enumeration{Colors.END}")
             results['status'] = 'completed'
+            self._flush_output()
             return results
         
         primary_domain = discovered_domains[0]
         
-        # 1. Enhanced DNS Record Enumeration
-        print(f"\n{Colors.GREEN}🎯 Phase 1: Enhanced DNS Record Enumeration{Colors.END}")
-        dns_results = self._enhanced_dns_records(primary_domain, run_command_func)
-        results['techniques']['dns_records'] = dns_results
-        
-        # 2. Subdomain Brute Force (HTB-optimized)
-        print(f"\n{Colors.GREEN}🎯 Phase 2: HTB-Optimized Subdomain Discovery{Colors.END}")
-        subdomain_results = self._htb_subdomain_bruteforce(primary_domain, run_command_func)
-        results['techniques']['subdomain_brute'] = subdomain_results
-        
-        # 3. Certificate Transparency Logs
-        print(f"\n{Colors.GREEN}🎯 Phase 3: Certificate Transparency Discovery{Colors.END}")
-        cert_results = self._certificate_transparency(primary_domain)
-        results['techniques']['certificate_transparency'] = cert_results
-        
-        # 4. DNS Zone Transfer Attempts
-        print(f"\n{Colors.GREEN}🎯 Phase 4: Zone Transfer Attempts{Colors.END}")
-        zone_results = self._zone_transfer_attempts(primary_domain, run_command_func)
-        results['techniques']['zone_transfers'] = zone_results
-        
-        # 5. Reverse DNS Lookups
-        print(f"\n{Colors.GREEN}🎯 Phase 5: Reverse DNS Analysis{Colors.END}")
-        reverse_results = self._reverse_dns_analysis(target_ip, run_command_func)
-        results['techniques']['reverse_dns'] = reverse_results
-        
-        # 6. Advanced Tools Integration
-        print(f"\n{Colors.GREEN}🎯 Phase 6: Advanced Tools Integration{Colors.END}")
-        tools_results = self._advanced_tools_enumeration(primary_domain, run_command_func)
-        results['techniques']['advanced_tools'] = tools_results
-        
-        # Consolidate results
+        # The six techniques have no data dependencies on each other, so run
+        # them side by side and report each phase as it finishes
+        phases = {
+            'dns_records': ("Phase 1: Enhanced DNS Record Enumeration",
+                            self._enhanced_dns_records, (primary_domain,)),
+            'subdomain_brute': ("Phase 2: HTB-Optimized Subdomain Discovery",
+                                self._htb_subdomain_bruteforce, (primary_domain,)),
+            'certificate_transparency': ("Phase 3: Certificate Transparency Discovery",
+                                         self._certificate_transparency, (primary_domain,)),
+            'zone_transfers': ("Phase 4: Zone Transfer Attempts",
+                               self._zone_transfer_attempts, (primary_domain,)),
+            'reverse_dns': ("Phase 5: Reverse DNS Analysis",
+                            self._reverse_dns_analysis, (target_ip,)),
+            'advanced_tools': ("Phase 6: Advanced Tools Integration",
+                               self._advanced_tools_enumeration, (primary_domain,)),
+        }
+        
+        logger.info(f"\n{Colors.GREEN}🎯 Running {len(phases)} enumeration phases concurrently{Colors.END}")
+        
+        with ThreadPoolExecutor(max_workers=len(phases)) as executor:
+            futures = {
+                executor.submit(phase_func, *args): technique
+                for technique, (_, phase_func, args) in phases.items()
+            }
+            
+            for future in as_completed(futures):
+                technique = futures[future]
+                try:
+                    results['techniques'][technique] = future.result()
+                    logger.info(f"\n{Colors.GREEN}✅ {phases[technique][0]} complete{Colors.END}")
+                except Exception as e:
+                    results['techniques'][technique] = {'domains': set(), 'error': str(e)}
+                    logger.error(f"\n{Colors.RED}❌ {phases[technique][0]} failed: {e}{Colors.END}")
+        
+        # Keep techniques in phase order regardless of completion order
+        results['techniques'] = {technique: results['techniques'][technique] for technique in phases}
+        
+        # Consolidate results - every technique reports 'domains' as a set
         all_domains = set()
         for technique_results in results['techniques'].values():
             if 'domains' in technique_results:
                 all_domains.update(technique_results['domains'])
         
         # Filter out original domains to get only new discoveries
-        original_domains_set = set(discovered_domains)
+        original_domains_set = frozenset(discovered_domains)
         new_domains = all_domains - original_domains_set
         
-        results['new_domains'] = list(new_domains)
+        results['new_domains'] = sorted(new_domains)
         results['total_domains'] = len(all_domains)
         results['new_count'] = len(new_domains)
         results['status'] = 'completed'
         
+        self.save_dns_cache()
+        
         # Summary
-        print(f"\n{Colors.GREEN}✅ Advanced DNS Enumeration Complete{Colors.END}")
-        print(f"{Colors.CYAN}📊 Results Summary:{Colors.END}")
-        print(f"   • Total domains found: {len(all_domains)}")
-        print(f"   • New domains: {len(new_domains)}")
-        print(f"   • DNS records: {len(results['dns_records'])}")
-        print(f"   • Certificate domains: {len(results['certificate_domains'])}")
+        logger.info(f"\n{Colors.GREEN}✅ Advanced DNS Enumeration Complete{Colors.END}")
+        logger.info(f"{Colors.CYAN}📊 Results Summary:{Colors.END}")
+        logger.info(f"   • Total domains found: {len(all_domains)}")
+        logger.info(f"   • New domains: {len(new_domains)}")
+        logger.info(f"   • DNS records: {len(results['dns_records'])}")
+        logger.info(f"   • Certificate domains: {len(results['certificate_domains'])}")
         
         if new_domains:
-            print(f"\n{Colors.YELLOW}🎯 New domains discovered:{Colors.END}")
-            for domain in sorted(new_domains):
-                print(f"   • {domain}")
+            logger.info(f"\n{Colors.YELLOW}🎯 New domains discovered:{Colors.END}")
+            for domain in results['new_domains']:
+                logger.info(f"   • {domain}")
         
+        self._flush_output()
         return results
     
-    def _enhanced_dns_records(self, domain: str, run_command_func) -> Dict:
+    def _enhanced_dns_records(self, domain: str) -> Dict:
         """Enhanced DNS record enumeration with multiple record types"""
         results = {
             'domains': set(),
@@ -135,83 +301,316 @@ class AdvancedDNSScanner:
         
         record_types = ['A', 'AAAA', 'CNAME', 'MX', 'TXT', 'NS', 'SOA', 'SRV', 'PTR']
         
-        for record_type in record_types:
-            print(f"  🔍 Querying {record_type} records for {domain}")
-            try:
-                cmd = f"dig +short {record_type} {domain}"
-                result = run_command_func(cmd, timeout=30)
-                
-                if result and result.get('success') and result.get('output'):
-                    output = result['output'].strip()
-                    if output and not output.startswith(';;'):
-                        results['records'][record_type] = output.split('\n')
+        # Record types are independent - query them all at once
+        with ThreadPoolExecutor(max_workers=len(record_types)) as executor:
+            futures = {}
+            for record_type in record_types:
+                logger.info(f"  🔍 Querying {record_type} records for {domain}")
+                futures[executor.submit(self._query_records, domain, record_type)] = record_type
+            
+            for future in as_completed(futures):
+                record_type = futures[future]
+                try:
+                    records = future.result()
+                    
+                    if records:
+                        results['records'][record_type] = records
                         
-                        # Extract domains from different record types
+                        # Extract domains from different record types in a
+                        # single pass (NS lines also give us the nameservers)
                         if record_type in ['CNAME', 'MX', 'NS']:
-                            for line in output.split('\n'):
-                                domain_match = re.search(r'([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', line)
+                            for line in records:
+                                domain_match = _DOMAIN_RE.search(line)
                                 if domain_match:
                                     found_domain = domain_match.group(1).rstrip('.')
                                     results['domains'].add(found_domain)
-                                    
-                        if record_type == 'NS':
-                            for line in output.split('\n'):
-                                results['nameservers'].add(line.strip().rstrip('.'))
+                                if record_type == 'NS':
+                                    results['nameservers'].add(line.rstrip('.'))
                         
-            except Exception as e:
-                print(f"    ❌ Error querying {record_type}: {e}")
+                except Exception as e:
+                    logger.error(f"    ❌ Error querying {record_type}: {e}")
         
-        print(f"  ✅ Found {len(results['records'])} record types, {len(results['domains'])} domains")
+        logger.info(f"  ✅ Found {len(results['records'])} record types, {len(results['domains'])} domains")
         return results
     
-    def _htb_subdomain_bruteforce(self, domain: str, run_command_func) -> Dict:
+    def _query_records(self, name: str, record_type: str) -> List[str]:
+        """Return the records of one type for a name, one text line per record
+        
+        Queries in-process with dnspython when available, otherwise falls
+        back to `dig +short`.
+        """
+        if self.resolver:
+            try:
+                answer = self.resolver.resolve(name, record_type)
+            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+                return []
+            return [rdata.to_text() for rdata in answer]
+        
+        result = subprocess.run([
+            'dig', '+short', record_type, name
+        ], capture_output=True, text=True, timeout=30)
+        
+        output = result.stdout.strip()
+        if result.returncode != 0 or not output or output.startswith(';;'):
+            return []
+        lines = [line.strip() for line in output.split('\n')]
+        return [line for line in lines if line]
+    
+    def _htb_subdomain_bruteforce(self, domain: str) -> Dict:
         """HTB-optimized subdomain brute force with common CTF patterns"""
         results = {
             'domains': set(),
             'valid_subdomains': [],
-            'tested_count': 0
+            'tested_count': 0,
+            'wildcard_detected': False,
+            'aborted_early': False
         }
         
-        # Combine HTB-specific with common subdomains
-        all_subdomains = self.htb_subdomains.copy()
+        # A name that can't exist - if it resolves, every candidate would too
+        wildcard_probe = f"ipsnipe-probe-{uuid.uuid4().hex[:12]}.{domain}"
+        wildcard_ip = self._resolve(wildcard_probe)
+        if wildcard_ip:
+            results['wildcard_detected'] = True
+            results['wildcard_ip'] = wildcard_ip
+            logger.warning(f"  ⚠️  Wildcard DNS detected ({domain} -> {wildcard_ip}), skipping brute force")
+            return results
         
-        # Add common variations
+        # Combine HTB-specific with common variations, dropping duplicates
+        # (dict.fromkeys keeps the first occurrence and preserves order)
         base_variations = ['dev', 'test', 'staging', 'prod', 'demo']
-        for variation in base_variations:
-            all_subdomains.extend([
-                f"{variation}1", f"{variation}2", f"{variation}-api",
-                f"api-{variation}", f"{variation}-web", f"web-{variation}"
-            ])
-        
-        print(f"  🎯 Testing {len(all_subdomains)} HTB-optimized subdomains")
+        all_subdomains = list(dict.fromkeys(
+            self.htb_subdomains
+            + [f"{variation}{suffix}" for variation in base_variations for suffix in ('1', '2', '-api', '-web')]
+            + [f"{prefix}-{variation}" for variation in base_variations for prefix in ('api', 'web')]
+        ))
+        
+        logger.info(f"  🎯 Testing {len(all_subdomains)} HTB-optimized subdomains")
+        
+        test_domains = [f"{subdomain}.{domain}" for subdomain in all_subdomains]
+        
+        # Answer what we can from the cache, resolve the rest
+        resolved = {}
+        pending = []
+        for test_domain in test_domains:
+            hit, ip = self._cache_lookup(test_domain)
+            if hit:
+                resolved[test_domain] = ip
+            else:
+                pending.append(test_domain)
+        
+        if len(pending) < len(test_domains):
+            logger.info(f"  💾 {len(test_domains) - len(pending)} lookups answered from cache")
+        
+        # Resolve all candidates concurrently: one event loop with many UDP
+        # queries in flight when dnspython is available, a thread pool otherwise.
+        # The guard stops sending queries once the server stops answering.
+        guard = _FailureGuard()
+        if pending:
+            if DNSPYTHON_AVAILABLE:
+                fresh = asyncio.run(self._async_resolve_all(pending, guard))
+            else:
+                fresh = self._threaded_resolve_all(pending, guard)
+            
+            # Only real answers (including "doesn't exist") are cached; names
+            # that went unanswered count as tested but are retried next run
+            for name, ip in fresh.items():
+                if ip is _UNANSWERED:
+                    resolved[name] = None
+                else:
+                    self._cache_store(name, ip)
+                    resolved[name] = ip
+        
+        if guard.tripped.is_set():
+            results['aborted_early'] = True
+            logger.warning(f"  ⚠️  DNS server stopped answering, aborted after "
+                           f"{len(resolved)}/{len(test_domains)} lookups")
         
-        # Batch DNS lookups for speed
         valid_subdomains = []
-        for subdomain in all_subdomains:
-            test_domain = f"{subdomain}.{domain}"
+        for test_domain in test_domains:
+            if test_domain not in resolved:
+                continue
             results['tested_count'] += 1
-            
-            try:
-                # Quick DNS resolution test
-                socket.gethostbyname(test_domain)
+            if resolved[test_domain]:
                 valid_subdomains.append(test_domain)
                 results['domains'].add(test_domain)
-                print(f"    ✅ {test_domain}")
-                
-            except socket.gaierror:
-                # Subdomain doesn't exist, continue
-                pass
-            except Exception as e:
-                # Other error, continue but note it
-                pass
+                logger.info(f"    ✅ {test_domain}")
         
         results['valid_subdomains'] = valid_subdomains
-        print(f"  ✅ Found {len(valid_subdomains)} valid subdomains from {results['tested_count']} tests")
+        logger.info(f"  ✅ Found {len(valid_subdomains)} valid subdomains from {results['tested_count']} tests")
         
         return results
     
+    async def _resolve_one(self, resolver, name: str, guard: _FailureGuard,
+                           semaphore: asyncio.Semaphore):
+        """Resolve a single name to its first A record
+        
+        None if the server says it doesn't exist, _UNANSWERED if no usable
+        answer came back.
+        """
+        async with semaphore:
+            if guard.tripped.is_set():
+                return _SKIPPED
+            try:
+                answer = await resolver.resolve(name, 'A')
+            except Exception as e:
+                negative = _is_negative_answer(e)
+                guard.record(not negative)
+                return None if negative else _UNANSWERED
+            guard.record(False)
+            return answer[0].to_text()
+    
+    async def _async_resolve_all(self, names: List[str], guard: _FailureGuard) -> Dict[str, Optional[str]]:
+        """Resolve names concurrently on a single event loop
+        
+        Names skipped after the guard tripped are left out of the result.
+        """
+        resolver = self._configure_resolver(dns.asyncresolver.Resolver())
+        semaphore = asyncio.Semaphore(self.config.get('advanced_dns', {}).get('workers', 50))
+        
+        answers = await asyncio.gather(
+            *[self._resolve_one(resolver, name, guard, semaphore) for name in names]
+        )
+        
+        return {
+            name: answer
+            for name, answer in zip(names, answers)
+            if answer is not _SKIPPED
+        }
+    
+    def _configure_resolver(self, resolver):
+        """Apply per-query timeouts and any configured upstream resolvers"""
+        dns_config = self.config.get('advanced_dns', {})
+        resolver.timeout = dns_config.get('query_timeout', 2)
+        resolver.lifetime = dns_config.get('query_lifetime', 3)
+        
+        nameservers = dns_config.get('resolvers')
+        if isinstance(nameservers, str):
+            nameservers = [ns.strip() for ns in nameservers.split(',') if ns.strip()]
+        if nameservers:
+            resolver.nameservers = list(nameservers)
+        
+        return resolver
+    
+    def _threaded_resolve_all(self, names: List[str], guard: _FailureGuard) -> Dict[str, Optional[str]]:
+        """Resolve names concurrently with the system resolver on a thread pool
+        
+        Names skipped after the guard tripped are left out of the result.
+        """
+        max_workers = self.config.get('advanced_dns', {}).get('workers', 50)
+        resolved = {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self._guarded_resolve, name, guard): name for name in names}
+            
+            for future in as_completed(futures):
+                ip = future.result()
+                if ip is not _SKIPPED:
+                    resolved[futures[future]] = ip
+        
+        return resolved
+    
+    def _guarded_resolve(self, name: str, guard: _FailureGuard):
+        """Resolve a name unless the guard has already tripped
+        
+        None if the server says it doesn't exist, _UNANSWERED if no usable
+        answer came back.
+        """
+        if guard.tripped.is_set():
+            return _SKIPPED
+        
+        try:
+            ip = self._lookup(name)
+        except Exception as e:
+            negative = _is_negative_answer(e)
+            guard.record(not negative)
+            return None if negative else _UNANSWERED
+        
+        guard.record(False)
+        return ip
+    
+    def _cached_resolve(self, name: str) -> Optional[str]:
+        """Resolve a name, consulting the cache first
+        
+        Uses the dnspython resolver (bounded by query_timeout/query_lifetime)
+        when available; socket.gethostbyname otherwise, which has no timeout.
+        """
+        hit, ip = self._cache_lookup(name)
+        if hit:
+            return ip
+        
+        try:
+            ip = self._lookup(name)
+        except Exception as e:
+            # Cache a definite miss too, but not a timeout or server failure
+            if not _is_negative_answer(e):
+                return None
+            ip = None
+        
+        self._cache_store(name, ip)
+        return ip
+    
+    def _resolve(self, name: str) -> Optional[str]:
+        """Resolve a name to its first A record, or None if it doesn't resolve"""
+        try:
+            return self._lookup(name)
+        except Exception:
+            # NXDOMAIN, NoAnswer, Timeout or gaierror
+            return None
+    
+    def _lookup(self, name: str) -> str:
+        """Resolve a name to its first A record, raising if it doesn't resolve"""
+        if self.resolver:
+            return self.resolver.resolve(name, 'A')[0].to_text()
+        return socket.gethostbyname(name)
+    
+    def _cache_lookup(self, name: str) -> Tuple[bool, Optional[str]]:
+        """Return (hit, ip) for a cached resolution that is still within its TTL"""
+        with self._cache_lock:
+            entry = self._dns_cache.get(name)
+        
+        if entry and time.time() - entry[0] < self.cache_ttl:
+            return True, entry[1]
+        return False, None
+    
+    def _cache_store(self, name: str, ip: Optional[str]):
+        """Record a resolution (or a miss, as None) in the cache"""
+        with self._cache_lock:
+            self._dns_cache[name] = (time.time(), ip)
+    
+    def _load_dns_cache(self) -> Dict[str, Tuple[float, Optional[str]]]:
+        """Load unexpired entries from the on-disk DNS cache"""
+        try:
+            with open(self.cache_file, 'r') as f:
+                entries = json.load(f)
+            
+            now = time.time()
+            return {
+                name: (resolved_at, ip)
+                for name, (resolved_at, ip) in entries.items()
+                if now - resolved_at < self.cache_ttl
+            }
+        except (OSError, ValueError, TypeError, AttributeError):
+            # Unreadable, or not the {name: [resolved_at, ip]} layout this
+            # version writes - start with an empty cache rather than fail
+            return {}
+    
+    def save_dns_cache(self):
+        """Persist the DNS cache so later runs can reuse it"""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with self._cache_lock:
+                entries = dict(self._dns_cache)
+            with open(self.cache_file, 'w') as f:
+                json.dump(entries, f)
+        except OSError as e:
+            logger.warning(f"{Colors.YELLOW}⚠️  Could not save DNS cache: {e}{Colors.END}")
+    
     def _certificate_transparency(self, domain: str) -> Dict:
         """Search certificate transparency logs for subdomains"""
+        if domain in self._ct_cache:
+            logger.info(f"  💾 Using cached certificate transparency results for {domain}")
+            return self._ct_cache[domain]
+        
         results = {
             'domains': set(),
             'certificates': [],
@@ -220,31 +619,52 @@ class AdvancedDNSScanner:
         
         # crt.sh API (most reliable for CTFs)
         try:
-            print(f"  🔍 Searching crt.sh for {domain}")
-            url = f"https://crt.sh/?q=%.{domain}&output=json"
-            response = requests.get(url, timeout=30)
-            
-            if response.status_code == 200:
-                certs = response.json()
-                results['sources'].append('crt.sh')
-                
-                for cert in certs:
-                    if 'name_value' in cert:
-                        names = cert['name_value'].split('\n')
-                        for name in names:
-                            name = name.strip().lower()
-                            # Filter out wildcards and add valid domains
-                            if '.' in name and not name.startswith('*'):
-                                results['domains'].add(name)
-                
-                print(f"    ✅ Found {len(results['domains'])} domains from certificates")
+            logger.info(f"  🔍 Searching crt.sh for {domain}")
+            # deduplicate=Y drops precertificate/certificate pairs server-side
+            url = f"https://crt.sh/?q=%.{domain}&output=json&deduplicate=Y"
+            with self.session.get(url, timeout=30, stream=True) as response:
+                if response.status_code == 200:
+                    results['sources'].append('crt.sh')
+                    
+                    # The same names repeat across many certificates, so skip
+                    # anything already seen before doing any further work
+                    seen = set()
+                    for cert in self._iter_certificates(response):
+                        if 'name_value' in cert:
+                            names = cert['name_value'].split('\n')
+                            for name in names:
+                                if name in seen:
+                                    continue
+                                seen.add(name)
+                                
+                                name = name.strip().lower()
+                                # A wildcard still vouches for its base name
+                                if name.startswith('*.'):
+                                    name = name[2:]
+                                if '.' in name and '*' not in name:
+                                    results['domains'].add(name)
+                    
+                    logger.info(f"    ✅ Found {len(results['domains'])} domains from certificates")
+                    self._ct_cache[domain] = results
                 
         except Exception as e:
-            print(f"    ❌ Certificate transparency search failed: {e}")
+            logger.error(f"    ❌ Certificate transparency search failed: {e}")
         
         return results
     
-    def _zone_transfer_attempts(self, domain: str, run_command_func) -> Dict:
+    def _iter_certificates(self, response):
+        """Yield certificate entries from a streamed crt.sh JSON response
+        
+        With ijson the array is parsed incrementally, so memory stays flat no
+        matter how many certificates crt.sh returns.
+        """
+        if IJSON_AVAILABLE:
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, 'item')
+        else:
+            yield from response.json()
+    
+    def _zone_transfer_attempts(self, domain: str) -> Dict:
         """Attempt DNS zone transfers against discovered nameservers"""
         results = {
             'domains': set(),
@@ -255,12 +675,9 @@ class AdvancedDNSScanner:
         # Get nameservers for the domain
         nameservers = set()
         try:
-            cmd = f"dig +short NS {domain}"
-            result = run_command_func(cmd, timeout=30)
-            if result and result.get('success') and result.get('output'):
-                for ns in result['output'].strip().split('\n'):
-                    if ns.strip():
-                        nameservers.add(ns.strip().rstrip('.'))
+            for ns in self._query_records(domain, 'NS'):
+                if ns.strip():
+                    nameservers.add(ns.strip().rstrip('.'))
         except Exception:
             pass
         
@@ -273,39 +690,64 @@ class AdvancedDNSScanner:
                 f"dns1.{base_domain}", f"dns2.{base_domain}", f"dns.{base_domain}"
             ])
         
-        print(f"  🎯 Testing zone transfers against {len(nameservers)} nameservers")
+        logger.info(f"  🎯 Testing zone transfers against {len(nameservers)} nameservers")
         
-        for ns in nameservers:
-            results['nameservers_tested'].append(ns)
-            try:
-                print(f"    🔍 Attempting zone transfer from {ns}")
-                cmd = f"dig @{ns} {domain} AXFR"
-                result = run_command_func(cmd, timeout=60)
-                
-                if result and result.get('success') and result.get('output'):
-                    output = result['output']
+        # Subdomains of the target zone, compiled once for every nameserver
+        zone_domain_re = re.compile(r'([a-zA-Z0-9.-]+\.' + re.escape(domain) + r')')
+        
+        def attempt_transfer(ns: str) -> List[str]:
+            logger.info(f"    🔍 Attempting zone transfer from {ns}")
+            return self._zone_transfer(ns, domain, zone_domain_re)
+        
+        # Transfers are independent per nameserver - try them all at once
+        with ThreadPoolExecutor(max_workers=max(1, min(len(nameservers), 16))) as executor:
+            futures = {}
+            for ns in nameservers:
+                results['nameservers_tested'].append(ns)
+                futures[executor.submit(attempt_transfer, ns)] = ns
+            
+            for future in as_completed(futures):
+                ns = futures[future]
+                try:
+                    domains_found = future.result()
                     
-                    # Check if zone transfer was successful
-                    if 'Transfer failed' not in output and 'connection timed out' not in output:
-                        # Extract domains from zone transfer
-                        domain_pattern = r'([a-zA-Z0-9.-]+\.' + re.escape(domain) + r')'
-                        domains_found = re.findall(domain_pattern, output)
-                        
-                        if domains_found:
-                            results['transfers'][ns] = domains_found
-                            results['domains'].update(domains_found)
-                            print(f"      ✅ Zone transfer successful! Found {len(domains_found)} domains")
-                        else:
-                            print(f"      ❌ Zone transfer denied")
+                    if domains_found:
+                        results['transfers'][ns] = domains_found
+                        results['domains'].update(domains_found)
+                        logger.info(f"      ✅ Zone transfer from {ns} successful! Found {len(domains_found)} domains")
                     else:
-                        print(f"      ❌ Zone transfer failed")
+                        logger.error(f"      ❌ Zone transfer denied by {ns}")
                         
-            except Exception as e:
-                print(f"      ❌ Error with {ns}: {e}")
+                except Exception as e:
+                    logger.error(f"      ❌ Zone transfer from {ns} failed: {e}")
         
         return results
     
-    def _reverse_dns_analysis(self, target_ip: str, run_command_func) -> Dict:
+    def _zone_transfer(self, ns: str, domain: str, zone_domain_re) -> List[str]:
+        """AXFR the zone from one nameserver and return the subdomains it holds
+        
+        Uses dnspython's in-process transfer when available, otherwise parses
+        `dig AXFR` output with zone_domain_re. Raises if the transfer fails.
+        """
+        if DNSPYTHON_AVAILABLE:
+            ns_ip = self._cached_resolve(ns)
+            if not ns_ip:
+                raise ValueError(f"could not resolve nameserver {ns}")
+            
+            zone = dns.zone.from_xfr(dns.query.xfr(ns_ip, domain, timeout=60, lifetime=60))
+            names = (name.derelativize(zone.origin).to_text().rstrip('.') for name in zone.nodes)
+            return [name for name in names if name.endswith(f".{domain}")]
+        
+        result = subprocess.run([
+            'dig', f'@{ns}', domain, 'AXFR'
+        ], capture_output=True, text=True, timeout=60)
+        
+        output = result.stdout
+        if 'Transfer failed' in output or 'connection timed out' in output:
+            raise RuntimeError("transfer failed")
+        return zone_domain_re.findall(output)
+    
+    def _reverse_dns_analysis(self, target_ip: str) -> Dict:
         """Perform reverse DNS analysis on target IP and nearby IPs"""
         results = {
             'domains': set(),
@@ -327,30 +769,58 @@ class AdvancedDNSScanner:
                     if 1 <= test_octet <= 254:
                         test_range.append(f"{base_ip}.{test_octet}")
                 
-                print(f"  🎯 Testing reverse DNS for {len(test_range)} nearby IPs")
+                logger.info(f"  🎯 Testing reverse DNS for {len(test_range)} nearby IPs")
                 
-                for test_ip in test_range:
-                    results['ip_range_tested'].append(test_ip)
-                    try:
-                        cmd = f"dig +short -x {test_ip}"
-                        result = run_command_func(cmd, timeout=10)
-                        
-                        if result and result.get('success') and result.get('output'):
-                            domain = result['output'].strip().rstrip('.')
+                # PTR lookups are independent - resolve the whole range at once
+                with ThreadPoolExecutor(max_workers=max(1, len(test_range))) as executor:
+                    futures = {}
+                    for test_ip in test_range:
+                        results['ip_range_tested'].append(test_ip)
+                        futures[executor.submit(self._reverse_lookup, test_ip)] = test_ip
+                    
+                    for future in as_completed(futures):
+                        test_ip = futures[future]
+                        try:
+                            domain = future.result().rstrip('.')
                             if domain and '.' in domain:
                                 results['domains'].add(domain)
                                 results['ip_domains'][test_ip] = domain
-                                print(f"    ✅ {test_ip} -> {domain}")
+                                logger.info(f"    ✅ {test_ip} -> {domain}")
                                 
-                    except Exception:
-                        pass
+                        except Exception:
+                            pass
         
         except Exception as e:
-            print(f"    ❌ Reverse DNS analysis error: {e}")
+            logger.error(f"    ❌ Reverse DNS analysis error: {e}")
         
         return results
     
-    def _advanced_tools_enumeration(self, domain: str, run_command_func) -> Dict:
+    def _reverse_lookup(self, ip: str) -> str:
+        """Return the PTR name for an IP address"""
+        if self.resolver:
+            answer = self.resolver.resolve(dns.reversename.from_address(ip), 'PTR')
+            return answer[0].to_text()
+        return socket.gethostbyaddr(ip)[0]
+    
+    def _detect_tools(self) -> Dict[str, bool]:
+        """Check which external enumeration tools are on PATH (cached)"""
+        if self._available_tools is None:
+            self._available_tools = {
+                tool: shutil.which(tool) is not None
+                for tool in ('subfinder', 'dnsrecon', 'amass')
+            }
+        return self._available_tools
+    
+    def _run_tool(self, command: List[str], timeout: int = 300) -> Dict:
+        """Run an enumeration tool and capture its output
+        
+        Called from worker threads, so this uses its own subprocess rather than
+        ScannerCore, whose progress indicator and current process are shared.
+        """
+        result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        return {'success': result.returncode == 0, 'output': result.stdout}
+    
+    def _advanced_tools_enumeration(self, domain: str) -> Dict:
         """Use advanced enumeration tools if available"""
         results = {
             'domains': set(),
@@ -358,77 +828,59 @@ class AdvancedDNSScanner:
             'tool_results': {}
         }
         
-        # 1. Try Subfinder (if available)
-        try:
-            print(f"  🔍 Testing Subfinder availability")
-            test_cmd = "subfinder -version"
-            test_result = run_command_func(test_cmd, timeout=10)
-            
-            if test_result and test_result.get('success'):
-                print(f"  🎯 Running Subfinder against {domain}")
-                cmd = f"subfinder -d {domain} -silent -t 20"
-                result = run_command_func(cmd, timeout=300)
-                
-                if result and result.get('success') and result.get('output'):
-                    subdomains = [line.strip() for line in result['output'].split('\n') if line.strip()]
-                    results['domains'].update(subdomains)
-                    results['tool_results']['subfinder'] = subdomains
-                    results['tools_used'].append('subfinder')
-                    print(f"    ✅ Subfinder found {len(subdomains)} subdomains")
-                    
-        except Exception as e:
-            print(f"    ❌ Subfinder error: {e}")
+        # Only keep the domain itself and its subdomains (a plain substring
+        # test would also accept e.g. notexample.com for example.com)
+        suffix = f".{domain}"
         
-        # 2. Try DNSRecon (if available)
-        try:
-            print(f"  🔍 Testing DNSRecon availability")
-            test_cmd = "dnsrecon -h"
-            test_result = run_command_func(test_cmd, timeout=10)
-            
-            if test_result and test_result.get('success'):
-                print(f"  🎯 Running DNSRecon against {domain}")
-                cmd = f"dnsrecon -d {domain} -t std,brt"
-                result = run_command_func(cmd, timeout=300)
+        available = self._detect_tools()
+        tool_jobs = {
+            'subfinder': ("Subfinder", ['subfinder', '-d', domain, '-silent', '-t', '20']),
+            'dnsrecon': ("DNSRecon", ['dnsrecon', '-d', domain, '-t', 'std,brt']),
+            'amass': ("Amass", ['amass', 'enum', '-passive', '-d', domain, '-timeout', '5']),
+        }
+        tool_jobs = {tool: job for tool, job in tool_jobs.items() if available[tool]}
+        
+        # Each tool is its own subprocess, so run them side by side - the phase
+        # then takes as long as the slowest tool rather than the sum of all three
+        if tool_jobs:
+            with ThreadPoolExecutor(max_workers=len(tool_jobs)) as executor:
+                futures = {}
+                for tool, (label, command) in tool_jobs.items():
+                    logger.info(f"  🎯 Running {label} against {domain}")
+                    futures[executor.submit(self._run_tool, command)] = tool
                 
-                if result and result.get('success') and result.get('output'):
-                    # Parse DNSRecon output for domains
-                    domain_pattern = r'([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-                    found_domains = re.findall(domain_pattern, result['output'])
-                    filtered_domains = [d for d in found_domains if domain in d]
-                    
-                    results['domains'].update(filtered_domains)
-                    results['tool_results']['dnsrecon'] = filtered_domains
-                    results['tools_used'].append('dnsrecon')
-                    print(f"    ✅ DNSRecon found {len(filtered_domains)} domains")
-                    
-        except Exception as e:
-            print(f"    ❌ DNSRecon error: {e}")
+                for future in as_completed(futures):
+                    tool = futures[future]
+                    label = tool_jobs[tool][0]
+                    try:
+                        result = future.result()
+                        if result and result.get('success') and result.get('output'):
+                            found = self._parse_tool_output(tool, result['output'], domain, suffix)
+                            results['domains'].update(found)
+                            results['tool_results'][tool] = found
+                            logger.info(f"    ✅ {label} found {len(found)} domains")
+                    except Exception as e:
+                        logger.error(f"    ❌ {label} error: {e}")
         
-        # 3. Try Amass (if available)
-        try:
-            print(f"  🔍 Testing Amass availability")
-            test_cmd = "amass -version"
-            test_result = run_command_func(test_cmd, timeout=10)
-            
-            if test_result and test_result.get('success'):
-                print(f"  🎯 Running Amass against {domain}")
-                cmd = f"amass enum -passive -d {domain} -timeout 5"
-                result = run_command_func(cmd, timeout=300)
-                
-                if result and result.get('success') and result.get('output'):
-                    subdomains = [line.strip() for line in result['output'].split('\n') 
-                                if line.strip() and domain in line.strip()]
-                    results['domains'].update(subdomains)
-                    results['tool_results']['amass'] = subdomains
-                    results['tools_used'].append('amass')
-                    print(f"    ✅ Amass found {len(subdomains)} subdomains")
-                    
-        except Exception as e:
-            print(f"    ❌ Amass error: {e}")
+        # Report tools in a stable order regardless of completion order
+        results['tools_used'] = [tool for tool in tool_jobs if tool in results['tool_results']]
         
         if results['tools_used']:
-            print(f"  ✅ Advanced tools used: {', '.join(results['tools_used'])}")
+            logger.info(f"  ✅ Advanced tools used: {', '.join(results['tools_used'])}")
         else:
-            print(f"  ℹ️  No advanced DNS tools available")
+            logger.info(f"  ℹ️  No advanced DNS tools available")
         
-        return results 
\ No newline at end of file
+        return results 
+    
+    def _parse_tool_output(self, tool: str, output: str, domain: str, suffix: str) -> Set[str]:
+        """Extract in-scope domains from subfinder, dnsrecon or amass output"""
+        if tool == 'dnsrecon':
+            # Parse DNSRecon output for domains
+            found_domains = _DOMAIN_RE.findall(output)
+            return {d for d in found_domains if d == domain or d.endswith(suffix)}
+        
+        # Subfinder and Amass print one name per line - split and strip once
+        lines = [line.strip() for line in output.split('\n')]
+        if tool == 'subfinder':
+            return {line for line in lines if line}
+        return {line for line in lines if line == domain or line.endswith(suffix)}
\ No newline at end of file
@@ -4,23 +4,202 @@ CMS Detection and Enumeration Scanner for ipsnipe
 Combines CMSeek and http-enum for comprehensive CMS identification
 """
 
+import atexit
+import mmap
+import os
+import re
+import shutil
 import subprocess
+import sys
+import tempfile
 import time
 import json
-from typing import Dict, List, Optional
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+from urllib.parse import urlsplit
 from ..ui.colors import Colors
 
 
+# Tool output is parsed straight from a read-only memory map, so every
+# pattern below is a bytes pattern
+
+# CMSeek output patterns -> the cms_info key they fill
+_CMSEEK_PATTERNS = [
+    (re.compile(rb'CMS:\s*(\w+)', re.IGNORECASE), 'type'),
+    (re.compile(rb'Version:\s*([^\n]+)', re.IGNORECASE), 'version'),
+    (re.compile(rb'Detected CMS:\s*(\w+)', re.IGNORECASE), 'type'),
+    (re.compile(rb'WordPress.*?(\d+\.\d+(?:\.\d+)?)', re.IGNORECASE), 'version'),
+    (re.compile(rb'Joomla.*?(\d+\.\d+(?:\.\d+)?)', re.IGNORECASE), 'version'),
+    (re.compile(rb'Drupal.*?(\d+\.\d+(?:\.\d+)?)', re.IGNORECASE), 'version')
+]
+
+# Where CMSeek may write Result/<host>/cms.json (cmseek.result_dir overrides)
+_CMSEEK_RESULT_DIRS = ('Result', '~/.cmseek/Result', '/usr/share/cmseek/Result')
+
+# Interesting directories and files reported by nmap http-enum
+_HTTP_ENUM_PATTERNS = [
+    re.compile(rb'http-enum:\s*(.+)'),
+    re.compile(rb'Interesting directory w/ listing on \d+/tcp:\s*(.+)'),
+    re.compile(rb'Interesting file on \d+/tcp:\s*(.+)'),
+    re.compile(rb'/([^/\s]+/).*?\(Status: \d+\)')
+]
+
+# Common CMS paths probed by the generic checks
+_COMMON_PATHS = (
+    '/admin/', '/administrator/', '/wp-admin/', '/admin.php',
+    '/login/', '/login.php', '/dashboard/', '/control/',
+    '/readme.txt', '/README.txt', '/CHANGELOG.txt',
+    '/robots.txt', '/sitemap.xml', '/.htaccess'
+)
+
+# CMS type keyword -> CMSScanner method building its targeted check job,
+# tried in order (first match wins)
+_CMS_DISPATCH = (
+    ('wordpress', '_wordpress_check_job'),
+    ('wp', '_wordpress_check_job'),
+    ('drupal', '_drupal_check_job'),
+    ('joomla', '_joomla_check_job'),
+)
+
+# Fetch a batch of URLs over concurrent connections instead of one after
+# another - only where curl has --parallel (7.66+), see _curl_supports_parallel
+_CURL_PARALLEL = ['--parallel', '--parallel-immediate', '--parallel-max', '6']
+_CURL_PARALLEL_MIN_VERSION = (7, 66)
+_CURL_VERSION_RE = re.compile(r'curl (\d+)\.(\d+)')
+
+# Each response body goes to its own file; stdout (the job's output file)
+# gets one line per URL saying what it returned
+_CURL_WRITE_OUT = '%{url_effective} %{http_code} %{size_download}\n'
+
+# Strings in http-enum output that point at a particular CMS
+_CMS_INDICATORS = {
+    'wordpress': ['wp-content', 'wp-admin', 'wp-includes', 'wp-login'],
+    'joomla': ['administrator', 'joomla', 'components', 'modules'],
+    'drupal': ['sites/default', 'misc', 'modules', 'themes', 'drupal'],
+    'magento': ['skin/frontend', 'js/mage', 'magento'],
+    'prestashop': ['prestashop', 'ps_'],
+    'opencart': ['opencart', 'catalog/view']
+}
+
+# Indicator -> every CMS it points at (e.g. 'modules' is Joomla and Drupal)
+_INDICATOR_TO_CMS = {
+    indicator.encode(): [cms for cms, indicators in _CMS_INDICATORS.items() if indicator in indicators]
+    for indicators in _CMS_INDICATORS.values()
+    for indicator in indicators
+}
+
+# One alternation over all indicators, longest first, so the output is
+# scanned once instead of once per CMS
+_CMS_INDICATOR_RE = re.compile(
+    b'|'.join(re.escape(indicator) for indicator in sorted(_INDICATOR_TO_CMS, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
+# Any of these in CMSeek's log flags potential vulnerabilities; a single
+# alternation finds the first one in one pass over the output
+_VULN_RE = re.compile(
+    b'|'.join(re.escape(indicator) for indicator in (
+        b'vulnerability', b'exploit', b'CVE-', b'security issue',
+        b'outdated', b'insecure', b'weak'
+    )),
+    re.IGNORECASE
+)
+
+
+def _remove_quietly(path: str):
+    """Delete a file, ignoring one that is already gone"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _target_slug(target: str) -> str:
+    """Filesystem-safe name for a target URL, e.g. http_10.10.10.5_80
+    
+    Used to give each target's result files their own names, since jobs for
+    several targets run at the same time.
+    """
+    return re.sub(r'[^A-Za-z0-9.-]+', '_', target).strip('_')
+
+
+@contextmanager
+def _mapped_output(output_file: str):
+    """Memory-map a tool output file read-only (an empty file maps to b'')"""
+    with open(output_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _find_cms_indicators(content) -> set:
+    """Return every CMS whose indicators appear in the content, in one pass"""
+    found_cms = set()
+    for match in _CMS_INDICATOR_RE.finditer(content):
+        found_cms.update(_INDICATOR_TO_CMS[match.group(0).lower()])
+        if len(found_cms) == len(_CMS_INDICATORS):
+            break
+    return found_cms
+
+
+# Tool availability and privileges don't change during a run, so each is
+# checked once per process
+@lru_cache(maxsize=None)
+def _tool_available(tool: str) -> bool:
+    """Check whether a tool is on PATH (no subprocess needed)"""
+    return shutil.which(tool) is not None
+
+
+@lru_cache(maxsize=None)
+def _curl_supports_parallel() -> bool:
+    """Check once whether the installed curl understands --parallel"""
+    try:
+        result = subprocess.run(['curl', '--version'], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return False
+    match = _CURL_VERSION_RE.match(result.stdout)
+    return bool(match) and (int(match.group(1)), int(match.group(2))) >= _CURL_PARALLEL_MIN_VERSION
+
+
+@lru_cache(maxsize=None)
+def _running_as_root() -> bool:
+    """Check whether this process can open raw sockets (needed for nmap -sS)"""
+    return hasattr(os, 'geteuid') and os.geteuid() == 0
+
+
 class CMSScanner:
     """CMS detection and enumeration functionality"""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, output_dir: Optional[str] = None):
         self.config = config
+        # Where tools that write their own files (e.g. wpscan --output) put them
+        self.output_dir = output_dir
+        # ffuf wordlist of _COMMON_PATHS, written once on first use
+        self._wordlist_path = None
         self.detected_cms = []
         self.cms_vulnerabilities = []
         self.cms_plugins = []
         self.http_enum_results = []
+        
+        # Per-target/per-finding status lines, written out in one go at
+        # phase boundaries instead of one print per line
+        self._status_lines = []
+    
+    def _status(self, line: str):
+        """Queue a status line for the next flush"""
+        self._status_lines.append(f"{line}\n")
+    
+    def _flush_status(self):
+        """Write all queued status lines with a single write"""
+        if self._status_lines:
+            sys.stdout.write(''.join(self._status_lines))
+            sys.stdout.flush()
+            self._status_lines.clear()
     
     def should_run_cms_scan(self, web_ports: List[int]) -> bool:
         """Determine if CMS scanning should run based on available web ports"""
@@ -33,10 +212,14 @@ class CMSScanner:
         return True
     
     def get_web_targets(self, target_ip: str, web_ports: List[int]) -> List[str]:
-        """Get all web targets for comprehensive CMS scanning"""
+        """Get all web targets for comprehensive CMS scanning
+        
+        Duplicate ports are dropped (first occurrence wins) so no phase
+        runs CMSeek or nmap twice against the same endpoint.
+        """
         targets = []
         
-        for port in web_ports:
+        for port in dict.fromkeys(web_ports):
             if port in [443, 8443]:
                 targets.append(f"https://{target_ip}:{port}")
             else:
@@ -44,10 +227,37 @@ class CMSScanner:
         
         return targets
     
-    def run_cmseek_scan(self, targets: List[str], run_command_func) -> Dict:
-        """Run CMSeek for comprehensive CMS detection"""
+    def run_cmseek_scan(self, targets: List[str], run_command_func, run_commands_func=None) -> Dict:
+        """Run CMSeek for comprehensive CMS detection
+        
+        Targets are independent, so when a concurrent runner is supplied every
+        CMSeek process is started at once and the phase takes as long as the
+        slowest target rather than the sum of all of them.
+        """
         print(f"{Colors.CYAN}🔍 Step 1: Running CMSeek comprehensive CMS detection...{Colors.END}")
         
+        jobs = self._cmseek_jobs(targets)
+        
+        if run_commands_func and len(jobs) > 1:
+            results = run_commands_func(jobs, max_workers=self._cmseek_max_parallel(len(jobs)))
+        else:
+            results = [run_command_func(*job) for job in jobs]
+        
+        return self._collect_cmseek_results(targets, results)
+    
+    def _cmseek_max_parallel(self, job_count: int) -> int:
+        """How many CMSeek processes may run against the target at once
+        
+        Taken from cmseek.max_parallel, defaulting to at most 8 so a long
+        web_ports list doesn't hammer the host into WAF/IDS throttling.
+        """
+        max_parallel = self.config.get('cmseek', {}).get('max_parallel')
+        if not max_parallel:
+            max_parallel = min(8, job_count)
+        return max(1, int(max_parallel))
+    
+    def _cmseek_jobs(self, targets: List[str]) -> List[Tuple[List[str], str, str, str]]:
+        """Build one CMSeek job per web target"""
         cmseek_config = self.config.get('cmseek', {
             'threads': 10,
             'timeout': 30,
@@ -55,10 +265,10 @@ class CMSScanner:
             'follow_redirect': True
         })
         
-        results = []
+        jobs = []
         
         for target in targets:
-            print(f"{Colors.CYAN}   📊 Analyzing: {target}{Colors.END}")
+            self._status(f"{Colors.CYAN}   📊 Analyzing: {target}{Colors.END}")
             
             command = [
                 'cmseek',
@@ -71,13 +281,19 @@ class CMSScanner:
             # Remove empty strings from command
             command = [arg for arg in command if arg]
             
-            result = run_command_func(command, f'cmseek_{target.replace("://", "_").replace(":", "_")}.txt', 
-                                    f'CMSeek CMS Detection - {target}', 'cmseek')
-            results.append(result)
-            
-            # Parse CMSeek results
+            jobs.append((command, f'cmseek_{_target_slug(target)}.txt',
+                         f'CMSeek CMS Detection - {target}', 'cmseek'))
+        
+        self._flush_status()
+        return jobs
+    
+    def _collect_cmseek_results(self, targets: List[str], results: List[Dict]) -> Dict:
+        """Parse finished CMSeek runs and summarise the phase"""
+        # Parse CMSeek results (in target order, once every scan has finished)
+        for target, result in zip(targets, results):
             if result['status'] == 'success':
-                self._parse_cmseek_results(result['output_file'], target)
+                self._parse_cmseek_results(result['output_file'], target, result.get('execution_time'))
+        self._flush_status()
         
         return {
             'status': 'success' if any(r['status'] == 'success' for r in results) else 'failed',
@@ -89,6 +305,11 @@ class CMSScanner:
         """Run nmap http-enum script for additional CMS detection"""
         print(f"{Colors.CYAN}🔍 Step 2: Running Nmap http-enum for web enumeration...{Colors.END}")
         
+        result = run_command_func(*self._http_enum_job(target_ip, web_ports))
+        return self._collect_http_enum_result(result)
+    
+    def _http_enum_job(self, target_ip: str, web_ports: List[int]) -> Tuple[List[str], str, str, str]:
+        """Build the nmap http-enum job covering every web port"""
         # Build port list for nmap
         port_list = ','.join(map(str, web_ports))
         
@@ -106,48 +327,56 @@ class CMSScanner:
             target_ip
         ]
         
-        result = run_command_func(command, 'nmap_http_enum.txt', 'Nmap HTTP Enumeration & CMS Detection', 'nmap')
-        
+        return (command, 'nmap_http_enum.txt', 'Nmap HTTP Enumeration & CMS Detection', 'nmap')
+    
+    def _collect_http_enum_result(self, result: Dict) -> Dict:
+        """Parse a finished http-enum run"""
         # Parse http-enum results
         if result['status'] == 'success':
             self._parse_http_enum_results(result['output_file'])
         
         return result
     
-    def run_additional_cms_checks(self, targets: List[str], run_command_func) -> Dict:
-        """Run additional CMS-specific checks and vulnerability scanning"""
+    def run_additional_cms_checks(self, targets: List[str], run_command_func, run_commands_func=None) -> Dict:
+        """Run additional CMS-specific checks and vulnerability scanning
+        
+        Each detected CMS gets one targeted tool run; these are independent
+        and, given a concurrent runner, run side by side (at most 8 at once).
+        """
         print(f"{Colors.CYAN}🔍 Step 3: Running additional CMS-specific checks...{Colors.END}")
         
-        results = []
+        # Work from a snapshot so the job list is fixed before anything runs
+        detected = tuple(self.detected_cms)
+        if not detected:
+            return {'status': 'skipped', 'reason': 'No CMS detected'}
         
-        for cms_info in self.detected_cms:
+        jobs = []
+        
+        for cms_info in detected:
             cms_type = cms_info.get('type', '').lower()
             target = cms_info.get('url', '')
             
             if not target:
                 continue
             
-            print(f"{Colors.CYAN}   🎯 Running targeted {cms_type.upper()} checks on {target}...{Colors.END}")
-            
-            # WordPress specific checks
-            if 'wordpress' in cms_type or 'wp' in cms_type:
-                wp_result = self._run_wordpress_checks(target, run_command_func)
-                results.append(wp_result)
-            
-            # Drupal specific checks
-            elif 'drupal' in cms_type:
-                drupal_result = self._run_drupal_checks(target, run_command_func)
-                results.append(drupal_result)
-            
-            # Joomla specific checks
-            elif 'joomla' in cms_type:
-                joomla_result = self._run_joomla_checks(target, run_command_func)
-                results.append(joomla_result)
+            self._status(f"{Colors.CYAN}   🎯 Running targeted {cms_type.upper()} checks on {target}...{Colors.END}")
             
-            # Generic CMS checks
+            # CMS specific checks, falling back to generic checks
+            job_builder = next(
+                (getattr(self, method) for keyword, method in _CMS_DISPATCH if keyword in cms_type),
+                None
+            )
+            if job_builder:
+                jobs.append(job_builder(target))
             else:
-                generic_result = self._run_generic_cms_checks(target, cms_type, run_command_func)
-                results.append(generic_result)
+                jobs.append(self._generic_cms_check_job(target, cms_type))
+        
+        self._flush_status()
+        
+        if run_commands_func and len(jobs) > 1:
+            results = run_commands_func(jobs, max_workers=min(8, len(jobs)))
+        else:
+            results = [run_command_func(*job) for job in jobs]
         
         return {
             'status': 'success' if results else 'skipped',
@@ -155,9 +384,11 @@ class CMSScanner:
             'targeted_scans': len([r for r in results if r['status'] == 'success'])
         }
     
-    def _run_wordpress_checks(self, target: str, run_command_func) -> Dict:
-        """Run WordPress-specific enumeration"""
-        print(f"{Colors.CYAN}     🔧 WordPress enumeration...{Colors.END}")
+    def _wordpress_check_job(self, target: str) -> Tuple[List[str], str, str, str]:
+        """Build the WordPress-specific enumeration job"""
+        self._status(f"{Colors.CYAN}     🔧 WordPress enumeration...{Colors.END}")
+        
+        slug = _target_slug(target)
         
         # Use WPScan if available, otherwise use nmap scripts
         if self._check_tool_available('wpscan'):
@@ -166,13 +397,13 @@ class CMSScanner:
                 '--url', target,
                 '--enumerate', 'p,t,u',  # plugins, themes, users
                 '--random-user-agent',
-                '--output', 'wpscan_results.txt'
+                '--output', os.path.join(self.output_dir or '.', f'wpscan_results_{slug}.txt')
             ]
             
-            return run_command_func(command, 'wordpress_wpscan.txt', f'WordPress WPScan - {target}', 'wpscan')
+            return (command, f'wordpress_wpscan_{slug}.txt', f'WordPress WPScan - {target}', 'wpscan')
         else:
             # Fall back to nmap WordPress scripts
-            domain = target.split('://')[1].split('/')[0]
+            domain = urlsplit(target).hostname
             
             command = [
                 'nmap',
@@ -181,11 +412,12 @@ class CMSScanner:
                 domain
             ]
             
-            return run_command_func(command, 'wordpress_nmap.txt', f'WordPress Nmap Scripts - {target}', 'nmap')
+            return (command, f'wordpress_nmap_{slug}.txt', f'WordPress Nmap Scripts - {target}', 'nmap')
     
-    def _run_drupal_checks(self, target: str, run_command_func) -> Dict:
-        """Run Drupal-specific enumeration"""
-        print(f"{Colors.CYAN}     🔧 Drupal enumeration...{Colors.END}")
+    def _drupal_check_job(self, target: str) -> Tuple[List[str], str, str, str]:
+        """Build the Drupal-specific enumeration job"""
+        self._status(f"{Colors.CYAN}     🔧 Drupal enumeration...{Colors.END}")
+        slug = _target_slug(target)
         
         # Use droopescan if available
         if self._check_tool_available('droopescan'):
@@ -196,22 +428,19 @@ class CMSScanner:
                 '-t', '10'
             ]
             
-            return run_command_func(command, 'drupal_droopescan.txt', f'Drupal Droopescan - {target}', 'droopescan')
+            return (command, f'drupal_droopescan_{slug}.txt', f'Drupal Droopescan - {target}', 'droopescan')
         else:
             # Fall back to basic enumeration
-            command = [
-                'curl',
-                '-s',
-                f"{target}/CHANGELOG.txt",
-                f"{target}/README.txt",
-                f"{target}/INSTALL.txt"
-            ]
+            command = self._curl_fetch_command(
+                target, ('/CHANGELOG.txt', '/README.txt', '/INSTALL.txt'), f'drupal_basic_{slug}'
+            )
             
-            return run_command_func(command, 'drupal_basic.txt', f'Drupal Basic Check - {target}', 'curl')
+            return (command, f'drupal_basic_{slug}.txt', f'Drupal Basic Check - {target}', 'curl')
     
-    def _run_joomla_checks(self, target: str, run_command_func) -> Dict:
-        """Run Joomla-specific enumeration"""
-        print(f"{Colors.CYAN}     🔧 Joomla enumeration...{Colors.END}")
+    def _joomla_check_job(self, target: str) -> Tuple[List[str], str, str, str]:
+        """Build the Joomla-specific enumeration job"""
+        self._status(f"{Colors.CYAN}     🔧 Joomla enumeration...{Colors.END}")
+        slug = _target_slug(target)
         
         # Use joomscan if available
         if self._check_tool_available('joomscan'):
@@ -221,37 +450,23 @@ class CMSScanner:
                 '--enumerate-components'
             ]
             
-            return run_command_func(command, 'joomla_joomscan.txt', f'Joomla JoomScan - {target}', 'joomscan')
+            return (command, f'joomla_joomscan_{slug}.txt', f'Joomla JoomScan - {target}', 'joomscan')
         else:
             # Basic Joomla checks
-            command = [
-                'curl',
-                '-s',
-                f"{target}/administrator/",
-                f"{target}/README.txt",
-                f"{target}/configuration.php-dist"
-            ]
+            command = self._curl_fetch_command(
+                target, ('/administrator/', '/README.txt', '/configuration.php-dist'), f'joomla_basic_{slug}'
+            )
             
-            return run_command_func(command, 'joomla_basic.txt', f'Joomla Basic Check - {target}', 'curl')
+            return (command, f'joomla_basic_{slug}.txt', f'Joomla Basic Check - {target}', 'curl')
     
-    def _run_generic_cms_checks(self, target: str, cms_type: str, run_command_func) -> Dict:
-        """Run generic CMS enumeration"""
-        print(f"{Colors.CYAN}     🔧 {cms_type.title()} generic enumeration...{Colors.END}")
-        
-        # Generic CMS enumeration using common paths
-        common_paths = [
-            '/admin/', '/administrator/', '/wp-admin/', '/admin.php',
-            '/login/', '/login.php', '/dashboard/', '/control/',
-            '/readme.txt', '/README.txt', '/CHANGELOG.txt',
-            '/robots.txt', '/sitemap.xml', '/.htaccess'
-        ]
+    def _generic_cms_check_job(self, target: str, cms_type: str) -> Tuple[List[str], str, str, str]:
+        """Build the generic CMS enumeration job"""
+        self._status(f"{Colors.CYAN}     🔧 {cms_type.title()} generic enumeration...{Colors.END}")
+        slug = _target_slug(target)
         
         # Use ffuf for directory enumeration if available
         if self._check_tool_available('ffuf'):
-            # Create temporary wordlist
-            wordlist_file = 'cms_paths.txt'
-            with open(wordlist_file, 'w') as f:
-                f.write('\n'.join([path.lstrip('/') for path in common_paths]))
+            wordlist_file = self._ensure_wordlist()
             
             command = [
                 'ffuf',
@@ -262,128 +477,192 @@ class CMSScanner:
                 '-s'  # Silent mode
             ]
             
-            return run_command_func(command, f'cms_enum_{cms_type}.txt', f'{cms_type.title()} Path Enumeration', 'ffuf')
+            return (command, f'cms_enum_{cms_type}_{slug}.txt', f'{cms_type.title()} Path Enumeration - {target}', 'ffuf')
         else:
             # Fall back to curl checks
-            command = ['curl', '-s'] + [f"{target}{path}" for path in common_paths]
+            command = self._curl_fetch_command(target, _COMMON_PATHS, f'cms_basic_{cms_type}_{slug}')
             
-            return run_command_func(command, f'cms_basic_{cms_type}.txt', f'{cms_type.title()} Basic Check', 'curl')
+            return (command, f'cms_basic_{cms_type}_{slug}.txt', f'{cms_type.title()} Basic Check - {target}', 'curl')
+    
+    def _curl_fetch_command(self, target: str, paths, name: str) -> List[str]:
+        """Build a curl command fetching each path under target
+        
+        Every body is saved as <name>_bodies/<path> in the output directory,
+        so responses can't interleave even when fetched in parallel.
+        """
+        body_dir = os.path.join(self.output_dir or '.', f'{name}_bodies')
+        command = ['curl', '-s', '--create-dirs', '-w', _CURL_WRITE_OUT]
+        if _curl_supports_parallel():
+            command += _CURL_PARALLEL
+        for path in paths:
+            command += ['-o', os.path.join(body_dir, _target_slug(path) or 'index'), f"{target}{path}"]
+        return command
+    
+    def _ensure_wordlist(self) -> str:
+        """Return the path of the shared generic-CMS ffuf wordlist, creating it once
+        
+        Written to the scan's output directory (next to the results that used
+        it) rather than the working directory, so concurrent jobs read the
+        same file instead of rewriting it under each other. Without an output
+        directory it goes to the temp dir and is removed at exit.
+        """
+        if self._wordlist_path and os.path.exists(self._wordlist_path):
+            return self._wordlist_path
+        
+        if self.output_dir:
+            wordlist_path = os.path.join(self.output_dir, 'cms_paths_wordlist.txt')
+            f = open(wordlist_path, 'w')
+        else:
+            fd, wordlist_path = tempfile.mkstemp(suffix='_cms_paths.txt', prefix='ipsnipe_')
+            f = os.fdopen(fd, 'w')
+            atexit.register(_remove_quietly, wordlist_path)
+        with f:
+            f.write('\n'.join(path.lstrip('/') for path in _COMMON_PATHS))
+        
+        self._wordlist_path = wordlist_path
+        return wordlist_path
     
-    def _parse_cmseek_results(self, output_file: str, target: str):
-        """Parse CMSeek results to extract CMS information"""
+    def _parse_cmseek_results(self, output_file: str, target: str, execution_time: Optional[float] = None):
+        """Parse CMSeek results to extract CMS information
+        
+        Prefers the structured cms.json CMSeek writes for the target and only
+        scrapes the text log when that file can't be found.
+        """
         try:
-            with open(output_file, 'r') as f:
-                content = f.read()
-            
             cms_info = {'url': target, 'source': 'cmseek'}
             
-            # Look for CMS detection patterns
-            import re
-            
-            # CMSeek patterns
-            cms_patterns = [
-                (r'CMS:\s*(\w+)', 'type'),
-                (r'Version:\s*([^\n]+)', 'version'),
-                (r'Detected CMS:\s*(\w+)', 'type'),
-                (r'WordPress.*?(\d+\.\d+(?:\.\d+)?)', 'version'),
-                (r'Joomla.*?(\d+\.\d+(?:\.\d+)?)', 'version'),
-                (r'Drupal.*?(\d+\.\d+(?:\.\d+)?)', 'version')
-            ]
-            
-            for pattern, key in cms_patterns:
-                match = re.search(pattern, content, re.IGNORECASE)
-                if match:
-                    cms_info[key] = match.group(1)
+            # Only trust a cms.json written during this run, not a stale one
+            # left behind by an earlier scan of the same host
+            not_before = os.path.getmtime(output_file) - (execution_time or 0) - 5
+            data = self._load_cmseek_json(target, not_before)
             
-            # Look for vulnerabilities
-            vuln_indicators = [
-                'vulnerability', 'exploit', 'CVE-', 'security issue',
-                'outdated', 'insecure', 'weak'
-            ]
-            
-            for indicator in vuln_indicators:
-                if indicator.lower() in content.lower():
-                    cms_info['potential_vulnerabilities'] = True
-                    break
+            if data and (data.get('cms_name') or data.get('cms_id')):
+                self._apply_cmseek_json(cms_info, data)
+            else:
+                self._scrape_cmseek_log(cms_info, output_file)
             
             if 'type' in cms_info:
                 self.detected_cms.append(cms_info)
-                print(f"{Colors.GREEN}   ✅ CMS detected: {cms_info.get('type', 'Unknown')} on {target}{Colors.END}")
+                self._status(f"{Colors.GREEN}   ✅ CMS detected: {cms_info.get('type', 'Unknown')} on {target}{Colors.END}")
                 
                 if 'version' in cms_info:
-                    print(f"{Colors.GREEN}      Version: {cms_info['version']}{Colors.END}")
+                    self._status(f"{Colors.GREEN}      Version: {cms_info['version']}{Colors.END}")
         
         except Exception as e:
-            print(f"{Colors.YELLOW}⚠️  Could not parse CMSeek results: {e}{Colors.END}")
+            self._status(f"{Colors.YELLOW}⚠️  Could not parse CMSeek results: {e}{Colors.END}")
+    
+    def _load_cmseek_json(self, target: str, not_before: float) -> Optional[Dict]:
+        """Load CMSeek's cms.json for a target, if it was written after not_before"""
+        parts = urlsplit(target)
+        # CMSeek names the directory after the host; allow for a port suffix
+        host_dirs = dict.fromkeys(name for name in (
+            parts.netloc, parts.netloc.replace(':', '_'), parts.hostname
+        ) if name)
+        
+        result_dir = self.config.get('cmseek', {}).get('result_dir')
+        result_dirs = [result_dir] if result_dir else _CMSEEK_RESULT_DIRS
+        
+        for base in result_dirs:
+            for host_dir in host_dirs:
+                path = Path(base).expanduser() / host_dir / 'cms.json'
+                if path.is_file() and path.stat().st_mtime >= not_before:
+                    with open(path, 'r') as f:
+                        return json.load(f)
+        return None
+    
+    def _apply_cmseek_json(self, cms_info: Dict, data: Dict):
+        """Fill cms_info from CMSeek's structured result"""
+        cms_info['type'] = data.get('cms_name') or data.get('cms_id')
+        
+        # The version key is CMS specific (wp_version, joomla_version, ...)
+        version = data.get('cms_version') or next(
+            (value for key, value in data.items() if key.endswith('_version') and value), None
+        )
+        if version:
+            cms_info['version'] = str(version)
+        
+        if any(value for key, value in data.items() if 'vuln' in key):
+            cms_info['potential_vulnerabilities'] = True
+    
+    def _scrape_cmseek_log(self, cms_info: Dict, output_file: str):
+        """Fill cms_info by pattern matching CMSeek's text output"""
+        with _mapped_output(output_file) as content:
+            # Look for CMS detection patterns
+            for pattern, key in _CMSEEK_PATTERNS:
+                match = pattern.search(content)
+                if match:
+                    cms_info[key] = match.group(1).decode('utf-8', 'replace').strip()
+            
+            # Look for vulnerabilities
+            if _VULN_RE.search(content):
+                cms_info['potential_vulnerabilities'] = True
     
     def _parse_http_enum_results(self, output_file: str):
         """Parse nmap http-enum results"""
         try:
-            with open(output_file, 'r') as f:
-                content = f.read()
-            
-            # Look for http-enum findings
-            import re
-            
-            # Extract interesting directories and files
-            enum_patterns = [
-                r'http-enum:\s*(.+)',
-                r'Interesting directory w/ listing on \d+/tcp:\s*(.+)',
-                r'Interesting file on \d+/tcp:\s*(.+)',
-                r'/([^/\s]+/).*?\(Status: \d+\)'
-            ]
+            with _mapped_output(output_file) as content:
+                # Extract interesting directories and files
+                findings = [
+                    match.strip().decode('utf-8', 'replace')
+                    for pattern in _HTTP_ENUM_PATTERNS
+                    for match in pattern.findall(content)
+                ]
+                
+                # Look for CMS indicators in http-enum
+                found_cms = _find_cms_indicators(content)
             
-            for pattern in enum_patterns:
-                matches = re.findall(pattern, content)
-                for match in matches:
-                    if match.strip():
-                        self.http_enum_results.append(match.strip())
-                        print(f"{Colors.GREEN}   ✅ HTTP enum found: {match.strip()}{Colors.END}")
+            for finding in findings:
+                if finding:
+                    self.http_enum_results.append(finding)
+                    self._status(f"{Colors.GREEN}   ✅ HTTP enum found: {finding}{Colors.END}")
             
-            # Look for CMS indicators in http-enum
-            cms_indicators = {
-                'wordpress': ['wp-content', 'wp-admin', 'wp-includes', 'wp-login'],
-                'joomla': ['administrator', 'joomla', 'components', 'modules'],
-                'drupal': ['sites/default', 'misc', 'modules', 'themes', 'drupal'],
-                'magento': ['skin/frontend', 'js/mage', 'magento'],
-                'prestashop': ['prestashop', 'ps_'],
-                'opencart': ['opencart', 'catalog/view']
-            }
+            # CMS types already detected (e.g. by CMSeek), lowercased once
+            detected_types = {c.get('type', '').lower() for c in self.detected_cms}
             
-            for cms, indicators in cms_indicators.items():
-                if any(indicator in content.lower() for indicator in indicators):
-                    cms_info = {
+            for cms in _CMS_INDICATORS:
+                if cms in found_cms and cms not in detected_types:
+                    self.detected_cms.append({
                         'type': cms,
                         'source': 'http-enum',
                         'confidence': 'medium'
-                    }
-                    
-                    # Check if already detected by CMSeek
-                    if not any(c['type'].lower() == cms for c in self.detected_cms):
-                        self.detected_cms.append(cms_info)
-                        print(f"{Colors.GREEN}   ✅ CMS detected by http-enum: {cms.title()}{Colors.END}")
+                    })
+                    detected_types.add(cms)
+                    self._status(f"{Colors.GREEN}   ✅ CMS detected by http-enum: {cms.title()}{Colors.END}")
         
         except Exception as e:
-            print(f"{Colors.YELLOW}⚠️  Could not parse http-enum results: {e}{Colors.END}")
+            self._status(f"{Colors.YELLOW}⚠️  Could not parse http-enum results: {e}{Colors.END}")
+        
+        self._flush_status()
     
     def _check_tool_available(self, tool: str) -> bool:
         """Check if a tool is available"""
-        try:
-            subprocess.run(['which', tool], capture_output=True, check=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return _tool_available(tool)
     
     def _check_sudo(self) -> bool:
-        """Check if sudo is available"""
-        try:
-            subprocess.run(['sudo', '-n', 'true'], capture_output=True, check=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        """Check if privileged (SYN) scans are possible
+        
+        nmap is started without sudo, so only a root process can use -sS.
+        """
+        return _running_as_root()
+    
+    def submit_comprehensive_cms_scan(self, executor: Executor, target_ip: str, web_ports: List[int],
+                                      run_command_func, run_commands_func=None) -> Future:
+        """Start comprehensive_cms_scan on executor and return its Future
+        
+        Lets a caller overlap the CMS scan with other independent work and
+        collect the result (e.g. via concurrent.futures.as_completed) when
+        it is ready.
+        """
+        return executor.submit(self.comprehensive_cms_scan, target_ip, web_ports,
+                               run_command_func, run_commands_func)
     
-    def comprehensive_cms_scan(self, target_ip: str, web_ports: List[int], run_command_func) -> Dict:
-        """Run comprehensive CMS detection and enumeration"""
+    def comprehensive_cms_scan(self, target_ip: str, web_ports: List[int], run_command_func,
+                               run_commands_func=None) -> Dict:
+        """Run comprehensive CMS detection and enumeration
+        
+        run_commands_func, if given, runs a list of (command, output_file,
+        description, scan_type) jobs concurrently and returns their results.
+        """
         if not self.should_run_cms_scan(web_ports):
             return {'status': 'skipped', 'reason': 'No web services detected'}
         
@@ -400,23 +679,39 @@ class CMSScanner:
             'phases': {}
         }
         
-        # Phase 1: CMSeek Detection
-        print(f"\n{Colors.BOLD}{Colors.BLUE}🔍 Phase 1: CMS Detection with CMSeek{Colors.END}")
-        
-        cmseek_result = self.run_cmseek_scan(targets, run_command_func)
-        results['phases']['cmseek'] = cmseek_result
-        
-        # Phase 2: HTTP Enumeration
-        print(f"\n{Colors.BOLD}{Colors.BLUE}📊 Phase 2: HTTP Enumeration with Nmap{Colors.END}")
-        
-        http_enum_result = self.run_http_enum_scan(target_ip, web_ports, run_command_func)
-        results['phases']['http_enum'] = http_enum_result
+        if run_commands_func:
+            # Phases 1 and 2 don't depend on each other - only Phase 3 needs
+            # their findings - so run CMSeek and http-enum as one batch
+            print(f"\n{Colors.BOLD}{Colors.BLUE}🔍 Phases 1 & 2: CMSeek and Nmap HTTP Enumeration{Colors.END}")
+            print(f"{Colors.CYAN}🔍 Step 1: Running CMSeek comprehensive CMS detection...{Colors.END}")
+            cmseek_jobs = self._cmseek_jobs(targets)
+            print(f"{Colors.CYAN}🔍 Step 2: Running Nmap http-enum for web enumeration...{Colors.END}")
+            # http-enum goes first so it always has its own worker; the
+            # remaining workers keep CMSeek within cmseek.max_parallel
+            jobs = [self._http_enum_job(target_ip, web_ports)] + cmseek_jobs
+            max_workers = self._cmseek_max_parallel(len(cmseek_jobs)) + 1
+            
+            batch_results = run_commands_func(jobs, max_workers=max_workers)
+            results['phases']['cmseek'] = self._collect_cmseek_results(targets, batch_results[1:])
+            results['phases']['http_enum'] = self._collect_http_enum_result(batch_results[0])
+        else:
+            # Phase 1: CMSeek Detection
+            print(f"\n{Colors.BOLD}{Colors.BLUE}🔍 Phase 1: CMS Detection with CMSeek{Colors.END}")
+            
+            cmseek_result = self.run_cmseek_scan(targets, run_command_func)
+            results['phases']['cmseek'] = cmseek_result
+            
+            # Phase 2: HTTP Enumeration
+            print(f"\n{Colors.BOLD}{Colors.BLUE}📊 Phase 2: HTTP Enumeration with Nmap{Colors.END}")
+            
+            http_enum_result = self.run_http_enum_scan(target_ip, web_ports, run_command_func)
+            results['phases']['http_enum'] = http_enum_result
         
         # Phase 3: CMS-Specific Testing
         print(f"\n{Colors.BOLD}{Colors.BLUE}🎯 Phase 3: CMS-Specific Testing{Colors.END}")
         
         if self.detected_cms:
-            cms_specific_result = self.run_additional_cms_checks(targets, run_command_func)
+            cms_specific_result = self.run_additional_cms_checks(targets, run_command_func, run_commands_func)
             results['phases']['cms_specific'] = cms_specific_result
         else:
             print(f"{Colors.YELLOW}⚠️  No CMS detected - skipping CMS-specific tests{Colors.END}")
@@ -440,94 +735,97 @@ class CMSScanner:
         """Generate a comprehensive CMS detection and enumeration report"""
         report_file = 'cms_comprehensive_report.txt'
         
-        with open(report_file, 'w') as f:
-            f.write("=" * 80 + "\n")
-            f.write("ipsnipe Comprehensive CMS Detection & Enumeration Report\n")
-            f.write("=" * 80 + "\n\n")
-            
-            f.write(f"Targets Scanned: {len(results['targets'])}\n")
-            f.write(f"Scan Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            
-            # CMS Detection Summary
-            f.write("🎯 CMS DETECTION SUMMARY\n")
-            f.write("-" * 40 + "\n")
-            f.write(f"Total CMS Systems Detected: {len(self.detected_cms)}\n\n")
-            
-            if self.detected_cms:
-                f.write("Detected CMS Systems:\n")
-                for cms in self.detected_cms:
-                    f.write(f"  • {cms.get('type', 'Unknown').title()}")
-                    if 'version' in cms:
-                        f.write(f" (Version: {cms['version']})")
-                    if 'url' in cms:
-                        f.write(f" - {cms['url']}")
-                    f.write(f" [Source: {cms.get('source', 'unknown')}]\n")
-                    
-                    if cms.get('potential_vulnerabilities'):
-                        f.write(f"    ⚠️  Potential security issues detected\n")
-                f.write("\n")
-            else:
-                f.write("No CMS systems detected.\n\n")
-            
-            # HTTP Enumeration Results
-            f.write("📊 HTTP ENUMERATION RESULTS\n")
-            f.write("-" * 40 + "\n")
-            f.write(f"Interesting Paths/Files Found: {len(self.http_enum_results)}\n\n")
-            
-            if self.http_enum_results:
-                f.write("Discovered Paths/Files:\n")
-                for result in self.http_enum_results[:20]:  # Limit to first 20
-                    f.write(f"  • {result}\n")
-                if len(self.http_enum_results) > 20:
-                    f.write(f"  ... and {len(self.http_enum_results) - 20} more entries\n")
-                f.write("\n")
+        # Collect the report in memory and write it with a single call
+        parts = []
+        append = parts.append
+        
+        append("=" * 80 + "\n")
+        append("ipsnipe Comprehensive CMS Detection & Enumeration Report\n")
+        append("=" * 80 + "\n\n")
+        
+        append(f"Targets Scanned: {len(results['targets'])}\n")
+        append(f"Scan Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        
+        # CMS Detection Summary
+        append("🎯 CMS DETECTION SUMMARY\n")
+        append("-" * 40 + "\n")
+        append(f"Total CMS Systems Detected: {len(self.detected_cms)}\n\n")
+        
+        if self.detected_cms:
+            append("Detected CMS Systems:\n")
+            for cms in self.detected_cms:
+                version = f" (Version: {cms['version']})" if 'version' in cms else ""
+                url = f" - {cms['url']}" if 'url' in cms else ""
+                append(f"  • {cms.get('type', 'Unknown').title()}{version}{url} "
+                       f"[Source: {cms.get('source', 'unknown')}]\n")
+                
+                if cms.get('potential_vulnerabilities'):
+                    append(f"    ⚠️  Potential security issues detected\n")
+            append("\n")
+        else:
+            append("No CMS systems detected.\n\n")
+        
+        # HTTP Enumeration Results
+        append("📊 HTTP ENUMERATION RESULTS\n")
+        append("-" * 40 + "\n")
+        append(f"Interesting Paths/Files Found: {len(self.http_enum_results)}\n\n")
+        
+        if self.http_enum_results:
+            append("Discovered Paths/Files:\n")
+            for result in self.http_enum_results[:20]:  # Limit to first 20
+                append(f"  • {result}\n")
+            if len(self.http_enum_results) > 20:
+                append(f"  ... and {len(self.http_enum_results) - 20} more entries\n")
+            append("\n")
+        
+        # Security Recommendations
+        append("🔐 SECURITY RECOMMENDATIONS\n")
+        append("-" * 40 + "\n")
+        
+        if self.detected_cms:
+            append("Based on detected CMS systems:\n")
             
-            # Security Recommendations
-            f.write("🔐 SECURITY RECOMMENDATIONS\n")
-            f.write("-" * 40 + "\n")
+            unique_cms = list(set(cms['type'].lower() for cms in self.detected_cms if 'type' in cms))
             
-            if self.detected_cms:
-                f.write("Based on detected CMS systems:\n")
+            for cms_type in unique_cms:
+                if 'wordpress' in cms_type:
+                    append("  📝 WordPress Security:\n")
+                    append("    • Keep WordPress core, themes, and plugins updated\n")
+                    append("    • Use strong admin passwords and 2FA\n")
+                    append("    • Consider security plugins (Wordfence, Sucuri)\n")
+                    append("    • Hide wp-admin from unauthorized access\n\n")
                 
-                unique_cms = list(set(cms['type'].lower() for cms in self.detected_cms if 'type' in cms))
+                elif 'joomla' in cms_type:
+                    append("  📝 Joomla Security:\n")
+                    append("    • Keep Joomla core and extensions updated\n")
+                    append("    • Secure administrator directory\n")
+                    append("    • Use strong passwords and enable 2FA\n")
+                    append("    • Regular security audits\n\n")
                 
-                for cms_type in unique_cms:
-                    if 'wordpress' in cms_type:
-                        f.write("  📝 WordPress Security:\n")
-                        f.write("    • Keep WordPress core, themes, and plugins updated\n")
-                        f.write("    • Use strong admin passwords and 2FA\n")
-                        f.write("    • Consider security plugins (Wordfence, Sucuri)\n")
-                        f.write("    • Hide wp-admin from unauthorized access\n\n")
-                    
-                    elif 'joomla' in cms_type:
-                        f.write("  📝 Joomla Security:\n")
-                        f.write("    • Keep Joomla core and extensions updated\n")
-                        f.write("    • Secure administrator directory\n")
-                        f.write("    • Use strong passwords and enable 2FA\n")
-                        f.write("    • Regular security audits\n\n")
-                    
-                    elif 'drupal' in cms_type:
-                        f.write("  📝 Drupal Security:\n")
-                        f.write("    • Keep Drupal core and modules updated\n")
-                        f.write("    • Follow Drupal security best practices\n")
-                        f.write("    • Regular security updates are critical\n")
-                        f.write("    • Secure file permissions\n\n")
-            else:
-                f.write("  • Implement web application security headers\n")
-                f.write("  • Regular security assessments\n")
-                f.write("  • Keep web server software updated\n")
-                f.write("  • Monitor for unauthorized changes\n\n")
-            
-            # Tool Execution Summary
-            f.write("🔧 TOOL EXECUTION SUMMARY\n")
-            f.write("-" * 40 + "\n")
-            for phase, result in results['phases'].items():
-                status = result.get('status', 'unknown')
-                f.write(f"  {phase.replace('_', ' ').title()}: {status.upper()}\n")
-            
-            f.write("\n")
-            f.write("=" * 80 + "\n")
-            f.write("For detailed results, check individual tool output files.\n")
-            f.write("=" * 80 + "\n")
+                elif 'drupal' in cms_type:
+                    append("  📝 Drupal Security:\n")
+                    append("    • Keep Drupal core and modules updated\n")
+                    append("    • Follow Drupal security best practices\n")
+                    append("    • Regular security updates are critical\n")
+                    append("    • Secure file permissions\n\n")
+        else:
+            append("  • Implement web application security headers\n")
+            append("  • Regular security assessments\n")
+            append("  • Keep web server software updated\n")
+            append("  • Monitor for unauthorized changes\n\n")
+        
+        # Tool Execution Summary
+        append("🔧 TOOL EXECUTION SUMMARY\n")
+        append("-" * 40 + "\n")
+        for phase, result in results['phases'].items():
+            status = result.get('status', 'unknown')
+            append(f"  {phase.replace('_', ' ').title()}: {status.upper()}\n")
+        
+        append("\n")
+        append("=" * 80 + "\n")
+        append("For detailed results, check individual tool output files.\n")
+        append("=" * 80 + "\n")
+        
+        Path(report_file).write_text(''.join(parts))
         
         print(f"{Colors.GREEN}📄 Comprehensive CMS report generated: {report_file}{Colors.END}") 
\ No newline at end of file
@@ -4,12 +4,113 @@ DNS scanner implementations for ipsnipe
 Handles theHarvester scanning and comprehensive dig-based DNS enumeration
 """
 
+import asyncio
+import itertools
 import subprocess
 import re
 import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Set, Optional, Tuple
 from ..ui.colors import Colors
 
+# dnspython is optional - without it every lookup shells out to dig
+try:
+    import dns.asyncresolver
+    import dns.exception
+    import dns.query
+    import dns.resolver
+    import dns.xfr
+    import dns.zone
+    DNSPYTHON_AVAILABLE = True
+    _DNS_TIMEOUTS = (dns.exception.Timeout,)
+except ImportError:
+    DNSPYTHON_AVAILABLE = False
+    _DNS_TIMEOUTS = ()
+
+# Common subdomains for brute forcing (dict.fromkeys drops repeats, keeping order)
+_COMMON_SUBDOMAINS: Tuple[str, ...] = tuple(dict.fromkeys([
+    'www', 'mail', 'email', 'webmail', 'admin', 'administrator', 'ftp', 'sftp',
+    'ssh', 'vpn', 'api', 'app', 'apps', 'blog', 'dev', 'test', 'stage', 'staging',
+    'prod', 'production', 'beta', 'alpha', 'demo', 'portal', 'shop', 'store',
+    'login', 'panel', 'dashboard', 'control', 'manage', 'management', 'support',
+    'help', 'docs', 'documentation', 'wiki', 'forum', 'forums', 'chat',
+    'ns1', 'ns2', 'dns1', 'dns2', 'mx1', 'mx2', 'smtp', 'pop', 'imap',
+    'cdn', 'static', 'assets', 'media', 'images', 'img', 'upload', 'uploads',
+    'download', 'downloads', 'files', 'file', 'share', 'cloud', 'backup',
+    'm', 'mobile', 'wap', 'secure', 'ssl', 'vpn', 'remote', 'access',
+    'intranet', 'internal', 'private', 'public', 'external', 'guest'
+]))
+
+# Brute-force names tried first on a wildcard domain to see if it's worth going on
+_WILDCARD_PROBES = 5
+
+# Record lines in `dig +noall +answer` output: owner, TTL, class, type, data
+_DIG_ANSWER_RE = re.compile(r'^(\S+)\s+\d+\s+IN\s+(A|CNAME)\s+(\S+)', re.MULTILINE)
+
+# Per-name result lines, formatted once rather than per hit
+_BRUTE_FOUND = f"{Colors.GREEN}   ✅ Found: %s{Colors.END}"
+_AXFR_FOUND = f"{Colors.GREEN}     📍 Found: %s{Colors.END}"
+
+# Owner name (first field) of every record line in `dig axfr` output;
+# comment lines start with ';'
+_AXFR_OWNER_RE = re.compile(rb'^([^;\s]\S*)', re.MULTILINE)
+
+
+class _AsyncRateLimiter:
+    """Spaces out query starts to at most `rate` per second (0 disables)"""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+    
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self._next_start > now:
+                await asyncio.sleep(self._next_start - now)
+                now = self._next_start
+            self._next_start = now + self.interval
+
+
+class _RttTracker:
+    """Keeps a moving average of DNS round trips to size query timeouts
+    
+    Until a few answers have been timed the full timeout is used; after
+    that a lookup gets four times the average round trip, never less than
+    half a second and never more than the full timeout.
+    """
+    
+    MIN_SAMPLES = 5
+    
+    def __init__(self, max_timeout: float):
+        self.max_timeout = max_timeout
+        self._lock = threading.Lock()
+        self._average = 0.0
+        self._samples = 0
+    
+    def record(self, elapsed: float):
+        with self._lock:
+            if self._samples:
+                self._average = 0.8 * self._average + 0.2 * elapsed
+            else:
+                self._average = elapsed
+            self._samples += 1
+    
+    def lifetime(self) -> float:
+        with self._lock:
+            if self._samples < self.MIN_SAMPLES:
+                return self.max_timeout
+            return min(self.max_timeout, max(0.5, 4 * self._average))
+
+
+class _ZoneTransferRefused(Exception):
+    """A nameserver answered but refused the zone transfer"""
+
 
 class DNSScanner:
     """DNS and information gathering scanning functionality"""
@@ -19,6 +120,34 @@ class DNSScanner:
         self.discovered_domains = set()
         self.discovered_subdomains = set()
         self.dns_records = {}
+        # Per-thread output buffer used while domains are enumerated in parallel
+        self._output = threading.local()
+        
+        # One resolver and answer cache shared by every lookup, so records
+        # asked for more than once (NS, SOA, ...) only go out once
+        self._resolver = None
+        self._dns_cache = None
+        if DNSPYTHON_AVAILABLE:
+            try:
+                self._dns_cache = dns.resolver.LRUCache(1024)
+                self._resolver = dns.resolver.Resolver()
+                self._resolver.cache = self._dns_cache
+                if self._upstream_resolvers():
+                    self._resolver.nameservers = self._upstream_resolvers()
+                    self._resolver.rotate = True
+            except Exception as e:
+                print(f"{Colors.YELLOW}⚠️  dnspython resolver unavailable, falling back to dig: {e}{Colors.END}")
+        
+        # Brute-force query timeout, adapted to how fast the resolver answers
+        self._rtt = _RttTracker(self.config.get('dns', {}).get('query_timeout', 5))
+        
+        # Wildcard answer IPs per domain, filled in by _detect_wildcards
+        self._wildcard_ips: Dict[str, Set[str]] = {}
+        
+        # Nameservers per domain as (expires_at, nameservers), reused until
+        # the answer's TTL runs out
+        self._nameservers = {}
+        self._nameservers_lock = threading.Lock()
     
     def comprehensive_dns_enumeration(self, target_ip: str, discovered_domains: List[str], run_command_func) -> Dict:
         """
@@ -42,34 +171,27 @@ class DNSScanner:
             'reverse_dns': {}
         }
         
-        for domain in discovered_domains:
-            print(f"\n{Colors.CYAN}🌐 Enumerating DNS for domain: {domain}{Colors.END}")
-            
-            # 1. Zone Transfer Attempts
-            zone_result = self._attempt_zone_transfer(domain)
-            if zone_result['success']:
-                all_results['zone_transfers'][domain] = zone_result
-                all_results['subdomains'].update(zone_result.get('subdomains', []))
-            
-            # 2. DNS Record Enumeration
-            dns_records = self._enumerate_dns_records(domain)
-            all_results['dns_records'][domain] = dns_records
-            
-            # 3. Nameserver Discovery
-            nameservers = self._discover_nameservers(domain)
-            all_results['nameservers'][domain] = nameservers
-            
-            # 4. Subdomain Brute Force
-            brute_subdomains = self._brute_force_subdomains(domain)
-            all_results['subdomains'].update(brute_subdomains)
-            
-            # 5. Wildcard Detection
-            wildcard_result = self._detect_wildcards(domain)
-            all_results['wildcards'][domain] = wildcard_result
+        # Reverse DNS on target IP - the same for every domain, so done once
+        all_results['reverse_dns'][target_ip] = self._reverse_dns_lookup(target_ip)
+        
+        # Domains are independent, so they are enumerated side by side. Each
+        # domain's output is buffered and printed as one block, in order.
+        max_workers = min(len(discovered_domains), 8)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            per_domain = executor.map(self._enumerate_domain_buffered, discovered_domains)
             
-            # 6. Reverse DNS on target IP
-            reverse_result = self._reverse_dns_lookup(target_ip)
-            all_results['reverse_dns'][target_ip] = reverse_result
+            for domain, (domain_result, lines) in zip(discovered_domains, per_domain):
+                print('\n'.join(lines))
+                
+                zone_result = domain_result['zone_transfer']
+                if zone_result['success']:
+                    all_results['zone_transfers'][domain] = zone_result
+                    all_results['subdomains'].update(zone_result.get('subdomains', []))
+                
+                all_results['dns_records'][domain] = domain_result['dns_records']
+                all_results['nameservers'][domain] = domain_result['nameservers']
+                all_results['subdomains'].update(domain_result['brute_subdomains'])
+                all_results['wildcards'][domain] = domain_result['wildcards']
         
         # Convert sets to lists for JSON serialization
         all_results['subdomains'] = list(all_results['subdomains'])
@@ -97,60 +219,85 @@ class DNSScanner:
                 'output_file': 'dns_enumeration.txt'
             }
     
+    def _enumerate_domain(self, domain: str) -> Dict:
+        """Run every enumeration step for a single domain"""
+        self._say(f"\n{Colors.CYAN}🌐 Enumerating DNS for domain: {domain}{Colors.END}")
+        
+        return {
+            # 1. Zone Transfer Attempts
+            'zone_transfer': self._attempt_zone_transfer(domain),
+            # 2. DNS Record Enumeration
+            'dns_records': self._enumerate_dns_records(domain),
+            # 3. Nameserver Discovery
+            'nameservers': self._discover_nameservers(domain),
+            # 4. Wildcard Detection (before brute force, which filters on it)
+            'wildcards': self._detect_wildcards(domain),
+            # 5. Subdomain Brute Force
+            'brute_subdomains': self._brute_force_subdomains(domain),
+        }
+    
+    def _enumerate_domain_buffered(self, domain: str) -> Tuple[Dict, List[str]]:
+        """Enumerate a domain, returning its result and the lines it printed"""
+        self._output.lines = []
+        try:
+            return self._enumerate_domain(domain), self._output.lines
+        finally:
+            self._output.lines = None
+    
+    def _say(self, message: str):
+        """Print a progress line, or buffer it while a domain is enumerated on a worker"""
+        lines = getattr(self._output, 'lines', None)
+        if lines is None:
+            print(message)
+        else:
+            lines.append(message)
+    
+    def _say_details(self, lines: List[str]):
+        """Print per-name result lines in one go, unless dns.quiet is set"""
+        if lines and not self.config.get('dns', {}).get('quiet', False):
+            self._say('\n'.join(lines))
+    
     def _attempt_zone_transfer(self, domain: str) -> Dict:
         """Attempt DNS zone transfer (AXFR) on the domain"""
-        print(f"{Colors.YELLOW}🔄 Attempting zone transfer for {domain}...{Colors.END}")
+        self._say(f"{Colors.YELLOW}🔄 Attempting zone transfer for {domain}...{Colors.END}")
         
         # First get nameservers
         nameservers = self._get_nameservers(domain)
         if not nameservers:
-            print(f"{Colors.YELLOW}   ⚠️  No nameservers found for {domain}{Colors.END}")
+            self._say(f"{Colors.YELLOW}   ⚠️  No nameservers found for {domain}{Colors.END}")
             return {'success': False, 'reason': 'No nameservers found'}
         
         subdomains = set()
         successful_transfers = []
         
         for ns in nameservers:
-            print(f"{Colors.CYAN}   🎯 Trying zone transfer from {ns}...{Colors.END}")
-            
+            self._say(f"{Colors.CYAN}   🎯 Trying zone transfer from {ns}...{Colors.END}")
+        
+        # Transfers are independent per nameserver, so try them all at once
+        # and report back in nameserver order
+        with ThreadPoolExecutor(max_workers=min(len(nameservers), 16)) as executor:
+            futures = [executor.submit(self._zone_transfer_from, ns, domain) for ns in nameservers]
+        
+        for ns, future in zip(nameservers, futures):
             try:
-                # Attempt AXFR
-                result = subprocess.run([
-                    'dig', 'axfr', domain, f'@{ns}'
-                ], capture_output=True, text=True, timeout=30)
-                
-                if result.returncode == 0 and result.stdout:
-                    # Check if transfer was successful (not refused)
-                    if 'Transfer failed' not in result.stdout and 'refused' not in result.stdout.lower():
-                        print(f"{Colors.GREEN}   ✅ Zone transfer successful from {ns}!{Colors.END}")
-                        successful_transfers.append(ns)
-                        
-                        # Parse subdomains from zone transfer
-                        for line in result.stdout.split('\n'):
-                            if line.strip() and not line.startswith(';'):
-                                # Extract subdomain from DNS record
-                                parts = line.split()
-                                if len(parts) >= 1:
-                                    subdomain = parts[0].rstrip('.')
-                                    if subdomain.endswith(f'.{domain}'):
-                                        full_subdomain = subdomain
-                                    elif subdomain != domain and '.' in subdomain:
-                                        full_subdomain = f"{subdomain}.{domain}"
-                                    else:
-                                        continue
-                                    
-                                    if full_subdomain != domain:
-                                        subdomains.add(full_subdomain)
-                                        print(f"{Colors.GREEN}     📍 Found: {full_subdomain}{Colors.END}")
-                    else:
-                        print(f"{Colors.YELLOW}   ⚠️  Zone transfer refused by {ns}{Colors.END}")
-                else:
-                    print(f"{Colors.YELLOW}   ⚠️  Zone transfer failed for {ns}{Colors.END}")
-                    
-            except subprocess.TimeoutExpired:
-                print(f"{Colors.YELLOW}   ⏰ Zone transfer timed out for {ns}{Colors.END}")
+                names = future.result()
+            except (subprocess.TimeoutExpired, *_DNS_TIMEOUTS):
+                self._say(f"{Colors.YELLOW}   ⏰ Zone transfer timed out for {ns}{Colors.END}")
+                continue
+            except _ZoneTransferRefused:
+                self._say(f"{Colors.YELLOW}   ⚠️  Zone transfer refused by {ns}{Colors.END}")
+                continue
             except Exception as e:
-                print(f"{Colors.YELLOW}   ⚠️  Error with {ns}: {str(e)}{Colors.END}")
+                self._say(f"{Colors.YELLOW}   ⚠️  Error with {ns}: {str(e)}{Colors.END}")
+                continue
+            
+            self._say(f"{Colors.GREEN}   ✅ Zone transfer successful from {ns}!{Colors.END}")
+            successful_transfers.append(ns)
+            
+            # Only names no earlier nameserver already gave us
+            new_names = set(names) - subdomains
+            subdomains |= new_names
+            self._say_details([_AXFR_FOUND % name for name in sorted(new_names)])
         
         if successful_transfers:
             return {
@@ -160,11 +307,96 @@ class DNSScanner:
                 'count': len(subdomains)
             }
         else:
-            print(f"{Colors.YELLOW}   ❌ All zone transfer attempts failed{Colors.END}")
+            self._say(f"{Colors.YELLOW}   ❌ All zone transfer attempts failed{Colors.END}")
             return {'success': False, 'reason': 'Zone transfers refused or failed'}
     
+    def _zone_transfer_from(self, ns: str, domain: str) -> List[str]:
+        """AXFR domain from one nameserver and return the subdomains in the zone
+        
+        Uses dnspython's in-process transfer when available, otherwise parses
+        `dig axfr` output. Raises _ZoneTransferRefused if the server refuses.
+        """
+        if not self._resolver:
+            return self._dig_zone_transfer(ns, domain)
+        
+        # The transfer needs the nameserver's address, not its name
+        ns_ip = self._resolver.resolve(ns, 'A', lifetime=10)[0].to_text()
+        
+        zone = dns.zone.Zone(domain)
+        try:
+            dns.query.inbound_xfr(ns_ip, zone, lifetime=30)
+        except dns.xfr.TransferError as e:
+            raise _ZoneTransferRefused(str(e)) from e
+        
+        names = (name.derelativize(zone.origin).to_text().rstrip('.') for name in zone.nodes)
+        return [name for name in names if name != domain]
+    
+    def _dig_zone_transfer(self, ns: str, domain: str) -> List[str]:
+        """AXFR domain from one nameserver with dig"""
+        result = subprocess.run([
+            'dig', 'axfr', domain, f'@{ns}'
+        ], capture_output=True, timeout=30)
+        
+        output = result.stdout
+        if result.returncode != 0 or not output:
+            raise RuntimeError("zone transfer failed")
+        
+        # Check if transfer was successful (not refused)
+        if b'Transfer failed' in output or b'refused' in output.lower():
+            raise _ZoneTransferRefused(ns)
+        
+        domain_bytes = domain.encode()
+        suffix = b'.' + domain_bytes
+        names = []
+        
+        # Parse subdomains from zone transfer: the owner name of each record
+        for match in _AXFR_OWNER_RE.finditer(output):
+            subdomain = match.group(1).rstrip(b'.')
+            if subdomain.endswith(suffix):
+                full_subdomain = subdomain
+            elif subdomain != domain_bytes and b'.' in subdomain:
+                full_subdomain = subdomain + suffix
+            else:
+                continue
+            
+            names.append(full_subdomain)
+        
+        # A zone lists most names several times (one line per record), so
+        # dedupe in one go and only decode the distinct names
+        return [name.decode('utf-8', 'replace') for name in set(names) - {domain_bytes}]
+    
     def _get_nameservers(self, domain: str) -> List[str]:
-        """Get nameservers for a domain"""
+        """Get nameservers for a domain (cached - zone transfers and discovery both ask)"""
+        with self._nameservers_lock:
+            entry = self._nameservers.get(domain)
+        if entry and time.time() < entry[0]:
+            return list(entry[1])
+        
+        nameservers, expires = self._lookup_nameservers(domain)
+        with self._nameservers_lock:
+            self._nameservers[domain] = (expires, nameservers)
+        return list(nameservers)
+    
+    def _lookup_nameservers(self, domain: str) -> Tuple[List[str], float]:
+        """Query NS records for a domain
+        
+        Returns the nameservers and when that answer expires: the record
+        TTL when dnspython provides it, dns.cache_ttl seconds otherwise.
+        """
+        expires = time.time() + self.config.get('dns', {}).get('cache_ttl', 300)
+        
+        if self._resolver:
+            try:
+                answer = self._resolver.resolve(domain, 'NS', lifetime=10)
+            except Exception:
+                return [], expires
+            nameservers = [record.to_text().rstrip('.') for record in answer]
+            return [ns for ns in nameservers if '.' in ns], answer.expiration
+        
+        return self._dig_nameservers(domain), expires
+    
+    def _dig_nameservers(self, domain: str) -> List[str]:
+        """Query NS records for a domain with dig"""
         try:
             result = subprocess.run([
                 'dig', 'NS', domain, '+short'
@@ -183,88 +415,234 @@ class DNSScanner:
     
     def _enumerate_dns_records(self, domain: str) -> Dict:
         """Enumerate various DNS record types"""
-        print(f"{Colors.YELLOW}📊 Enumerating DNS records for {domain}...{Colors.END}")
+        self._say(f"{Colors.YELLOW}📊 Enumerating DNS records for {domain}...{Colors.END}")
         
         record_types = ['A', 'AAAA', 'CNAME', 'MX', 'TXT', 'NS', 'SOA', 'SRV']
         records = {}
         
+        # All record types are queried at once with dnspython, one dig each otherwise
+        if self._resolver:
+            answers = asyncio.run(self._async_query_records(domain, record_types))
+        else:
+            answers = {record_type: self._dig_records(domain, record_type) for record_type in record_types}
+        
         for record_type in record_types:
-            try:
-                result = subprocess.run([
-                    'dig', record_type, domain, '+short'
-                ], capture_output=True, text=True, timeout=10)
-                
-                if result.returncode == 0 and result.stdout.strip():
-                    records[record_type] = result.stdout.strip().split('\n')
-                    print(f"{Colors.GREEN}   ✅ {record_type}: {len(records[record_type])} record(s){Colors.END}")
-                    
-                    # Look for subdomains in CNAME records
-                    if record_type == 'CNAME':
-                        for cname in records[record_type]:
-                            cname = cname.rstrip('.')
-                            if cname.endswith(f'.{domain}') and cname != domain:
-                                self.discovered_subdomains.add(cname)
+            answer = answers[record_type]
+            
+            if isinstance(answer, Exception):
+                self._say(f"{Colors.YELLOW}   ⚠️  Failed to get {record_type} records: {str(answer)}{Colors.END}")
+                continue
+            
+            if answer:
+                records[record_type] = answer
+                self._say(f"{Colors.GREEN}   ✅ {record_type}: {len(answer)} record(s){Colors.END}")
                 
-            except Exception as e:
-                print(f"{Colors.YELLOW}   ⚠️  Failed to get {record_type} records: {str(e)}{Colors.END}")
+                # Look for subdomains in CNAME records
+                if record_type == 'CNAME':
+                    for cname in answer:
+                        cname = cname.rstrip('.')
+                        if cname.endswith(f'.{domain}') and cname != domain:
+                            self.discovered_subdomains.add(cname)
         
         return records
     
+    async def _async_query_records(self, domain: str, record_types: List[str]) -> Dict:
+        """Query every record type for a domain concurrently
+        
+        Maps each type to its records ([] if there are none), or to the
+        exception if the query itself failed.
+        """
+        resolver = self._async_resolver()
+        resolver.lifetime = 10
+        
+        async def query(record_type: str) -> List[str]:
+            try:
+                answer = await resolver.resolve(domain, record_type, raise_on_no_answer=False)
+            except (dns.resolver.NXDOMAIN, dns.resolver.NoNameservers):
+                return []
+            if answer.rrset is None:
+                return []
+            return [record.to_text() for record in answer.rrset]
+        
+        answers = await asyncio.gather(*[query(record_type) for record_type in record_types],
+                                       return_exceptions=True)
+        return dict(zip(record_types, answers))
+    
+    def _dig_records(self, domain: str, record_type: str):
+        """Query one record type with dig, returning the records or the exception"""
+        try:
+            result = subprocess.run([
+                'dig', record_type, domain, '+short'
+            ], capture_output=True, text=True, timeout=10)
+        except Exception as e:
+            return e
+        
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip().split('\n')
+        return []
+    
     def _discover_nameservers(self, domain: str) -> List[str]:
         """Discover nameservers and try zone transfers"""
         nameservers = self._get_nameservers(domain)
         if nameservers:
-            print(f"{Colors.GREEN}   🌐 Nameservers: {nameservers}{Colors.END}")
+            self._say(f"{Colors.GREEN}   🌐 Nameservers: {nameservers}{Colors.END}")
         return nameservers
     
     def _brute_force_subdomains(self, domain: str) -> Set[str]:
         """Brute force common subdomains"""
-        print(f"{Colors.YELLOW}🔨 Brute forcing common subdomains for {domain}...{Colors.END}")
-        
-        # Common subdomain list
-        common_subdomains = [
-            'www', 'mail', 'email', 'webmail', 'admin', 'administrator', 'ftp', 'sftp',
-            'ssh', 'vpn', 'api', 'app', 'apps', 'blog', 'dev', 'test', 'stage', 'staging',
-            'prod', 'production', 'beta', 'alpha', 'demo', 'portal', 'shop', 'store',
-            'login', 'panel', 'dashboard', 'control', 'manage', 'management', 'support',
-            'help', 'docs', 'documentation', 'wiki', 'forum', 'forums', 'chat',
-            'ns1', 'ns2', 'dns1', 'dns2', 'mx1', 'mx2', 'smtp', 'pop', 'imap',
-            'cdn', 'static', 'assets', 'media', 'images', 'img', 'upload', 'uploads',
-            'download', 'downloads', 'files', 'file', 'share', 'cloud', 'backup',
-            'm', 'mobile', 'wap', 'secure', 'ssl', 'vpn', 'remote', 'access',
-            'intranet', 'internal', 'private', 'public', 'external', 'guest'
-        ]
+        self._say(f"{Colors.YELLOW}🔨 Brute forcing common subdomains for {domain}...{Colors.END}")
         
         discovered = set()
+        candidates = [f"{subdomain}.{domain}" for subdomain in _COMMON_SUBDOMAINS]
+        answers = {}
         
-        for subdomain in common_subdomains:
-            full_domain = f"{subdomain}.{domain}"
-            
-            try:
-                # Quick DNS lookup
-                result = subprocess.run([
-                    'dig', 'A', full_domain, '+short'
-                ], capture_output=True, text=True, timeout=5)
-                
-                if result.returncode == 0 and result.stdout.strip():
-                    # Verify it's not a wildcard response
-                    if not self._is_wildcard_response(domain, result.stdout.strip()):
-                        discovered.add(full_domain)
-                        print(f"{Colors.GREEN}   ✅ Found: {full_domain}{Colors.END}")
-                
-            except Exception:
-                continue
+        # On a wildcard domain, try a few names first: if they all come back
+        # with the wildcard IPs the rest would too, and would all be filtered.
+        # A probe that timed out or came back empty proves nothing either way
+        if self._wildcard_ips.get(domain):
+            probes = candidates[:_WILDCARD_PROBES]
+            answers = self._resolve_candidates(probes)
+            if all(answers[name] and self._is_wildcard_response(domain, answers[name])
+                   for name in probes):
+                self._say(f"{Colors.YELLOW}   ⏭️  First {len(probes)} names all hit the wildcard - "
+                          f"skipping brute force{Colors.END}")
+                return discovered
+        
+        answers.update(self._resolve_candidates([name for name in candidates if name not in answers]))
+        
+        found_lines = []
+        for full_domain in candidates:
+            ips = answers.get(full_domain)
+            # Verify it's not a wildcard response
+            if ips and not self._is_wildcard_response(domain, ips):
+                discovered.add(full_domain)
+                found_lines.append(_BRUTE_FOUND % full_domain)
+        self._say_details(found_lines)
         
         if discovered:
-            print(f"{Colors.GREEN}   🎯 Brute force found {len(discovered)} subdomains{Colors.END}")
+            self._say(f"{Colors.GREEN}   🎯 Brute force found {len(discovered)} subdomains{Colors.END}")
         else:
-            print(f"{Colors.YELLOW}   ℹ️  No subdomains found via brute force{Colors.END}")
+            self._say(f"{Colors.YELLOW}   ℹ️  No subdomains found via brute force{Colors.END}")
         
         return discovered
     
+    def _resolve_candidates(self, names: List[str]) -> Dict[str, List[str]]:
+        """Resolve A records for brute-force candidates
+        
+        With dnspython every name is in flight at once on one event loop;
+        otherwise fall back to one dig per name.
+        """
+        if self._resolver:
+            return asyncio.run(self._async_resolve_all(names))
+        return self._dig_batch_a(names)
+    
+    async def _async_resolve_all(self, names: List[str]) -> Dict[str, List[str]]:
+        """Resolve A records for all names concurrently
+        
+        Names that don't resolve (NXDOMAIN, no answer, timeout) map to [].
+        """
+        dns_config = self.config.get('dns', {})
+        
+        # One resolver per configured upstream, taken in turn so no single
+        # server's rate limit caps the whole run
+        upstreams = self._upstream_resolvers()
+        resolvers = [self._async_resolver([ns]) for ns in upstreams] or [self._async_resolver()]
+        rotation = itertools.cycle(resolvers)
+        
+        semaphore = asyncio.Semaphore(dns_config.get('workers', 50))
+        limiter = _AsyncRateLimiter(dns_config.get('rate_limit', 0))
+        
+        loop = asyncio.get_running_loop()
+        
+        async def resolve(name: str) -> List[str]:
+            async with semaphore:
+                await limiter.wait()
+                started = loop.time()
+                try:
+                    answer = await next(rotation).resolve(name, 'A', lifetime=self._rtt.lifetime())
+                except dns.resolver.NXDOMAIN:
+                    # A definite "no" is still a measured round trip
+                    self._rtt.record(loop.time() - started)
+                    return []
+                except Exception:
+                    return []
+                self._rtt.record(loop.time() - started)
+                return [record.to_text() for record in answer]
+        
+        answers = await asyncio.gather(*[resolve(name) for name in names])
+        return dict(zip(names, answers))
+    
+    def _async_resolver(self, nameservers: Optional[List[str]] = None):
+        """Create an async resolver backed by the scanner's shared answer cache
+        
+        Uses the given nameservers, else the configured upstreams, else
+        /etc/resolv.conf.
+        """
+        resolver = dns.asyncresolver.Resolver()
+        resolver.cache = self._dns_cache
+        nameservers = nameservers or self._upstream_resolvers()
+        if nameservers:
+            resolver.nameservers = list(nameservers)
+        return resolver
+    
+    def _upstream_resolvers(self) -> List[str]:
+        """Resolver IPs from dns.resolvers ([] means use /etc/resolv.conf)"""
+        nameservers = self.config.get('dns', {}).get('resolvers') or []
+        if isinstance(nameservers, str):
+            nameservers = [ns.strip() for ns in nameservers.split(',') if ns.strip()]
+        return list(nameservers)
+    
+    def _dig_batch_a(self, names: List[str]) -> Dict[str, List[str]]:
+        """Resolve A records for many names with a single dig process
+        
+        dig reads the queries from stdin (batch mode) and prints every answer
+        section; answers are mapped back to the queried names, following
+        CNAMEs. Names that don't resolve map to [].
+        """
+        answers = {name: [] for name in names}
+        if not names:
+            return answers
+        
+        # Spread queries over the configured upstreams, if any
+        servers = itertools.cycle([f" @{ns}" for ns in self._upstream_resolvers()] or [''])
+        
+        try:
+            result = subprocess.run(
+                ['dig', '-f', '-', '+noall', '+answer', '+time=3', '+tries=1'],
+                input=''.join(f"{name} A{next(servers)}\n" for name in names),
+                capture_output=True, text=True, timeout=5 * len(names)
+            )
+        except Exception:
+            return answers
+        
+        records = {}
+        for owner, record_type, data in _DIG_ANSWER_RE.findall(result.stdout):
+            records.setdefault(owner.rstrip('.').lower(), []).append((record_type, data.rstrip('.')))
+        
+        for name in names:
+            answers[name] = self._follow_answer(records, name.lower())
+        return answers
+    
+    @staticmethod
+    def _follow_answer(records: Dict[str, List[Tuple[str, str]]], name: str) -> List[str]:
+        """Collect the A records for name, following CNAMEs (as dig +short shows them)"""
+        found = []
+        seen = set()
+        pending = [name]
+        while pending:
+            owner = pending.pop(0)
+            if owner in seen:
+                continue
+            seen.add(owner)
+            for record_type, data in records.get(owner, ()):
+                found.append(data)
+                if record_type == 'CNAME':
+                    pending.append(data.lower())
+        return found
+    
     def _detect_wildcards(self, domain: str) -> Dict:
         """Detect if domain has wildcard DNS responses"""
-        print(f"{Colors.YELLOW}🃏 Detecting wildcard DNS for {domain}...{Colors.END}")
+        self._say(f"{Colors.YELLOW}🃏 Detecting wildcard DNS for {domain}...{Colors.END}")
         
         # Test with random subdomains
         test_subdomains = [
@@ -273,122 +651,174 @@ class DNSScanner:
             'randomtest789'
         ]
         
-        wildcard_ips = set()
+        test_domains = [f"{test_sub}.{domain}" for test_sub in test_subdomains]
         
-        for test_sub in test_subdomains:
-            test_domain = f"{test_sub}.{domain}"
-            
-            try:
-                result = subprocess.run([
-                    'dig', 'A', test_domain, '+short'
-                ], capture_output=True, text=True, timeout=5)
-                
-                if result.returncode == 0 and result.stdout.strip():
-                    ips = result.stdout.strip().split('\n')
-                    wildcard_ips.update(ips)
-            except Exception:
-                continue
+        if self._resolver:
+            wildcard_ips = asyncio.run(self._async_wildcard_probe(test_domains))
+        else:
+            wildcard_ips = set()
+            for ips in self._dig_batch_a(test_domains).values():
+                wildcard_ips.update(ips)
+        
+        # Brute force compares its answers against these
+        self._wildcard_ips[domain] = wildcard_ips
         
         if wildcard_ips:
-            print(f"{Colors.YELLOW}   ⚠️  Wildcard DNS detected! IPs: {list(wildcard_ips)}{Colors.END}")
-            print(f"{Colors.CYAN}   💡 Subdomain brute force may be less reliable{Colors.END}")
+            self._say(f"{Colors.YELLOW}   ⚠️  Wildcard DNS detected! IPs: {list(wildcard_ips)}{Colors.END}")
+            self._say(f"{Colors.CYAN}   💡 Subdomain brute force may be less reliable{Colors.END}")
             return {'has_wildcard': True, 'wildcard_ips': list(wildcard_ips)}
         else:
-            print(f"{Colors.GREEN}   ✅ No wildcard DNS detected{Colors.END}")
+            self._say(f"{Colors.GREEN}   ✅ No wildcard DNS detected{Colors.END}")
             return {'has_wildcard': False, 'wildcard_ips': []}
     
-    def _is_wildcard_response(self, domain: str, response_ip: str) -> bool:
-        """Check if a response IP is a wildcard response"""
-        # This is a simplified check - in reality you'd want to cache wildcard IPs
-        # and compare against them
-        return False
+    async def _async_wildcard_probe(self, test_domains: List[str]) -> Set[str]:
+        """Resolve the random test names concurrently and return the wildcard IPs
+        
+        Stops as soon as the outcome is settled: two answers sharing an IP
+        confirm a wildcard, two names that don't resolve rule one out.
+        Otherwise every answer counts, as with the dig fallback.
+        """
+        resolver = self._async_resolver()
+        resolver.lifetime = 5
+        
+        async def resolve(name: str) -> Set[str]:
+            try:
+                answer = await resolver.resolve(name, 'A')
+            except Exception:
+                return set()
+            return {record.to_text() for record in answer}
+        
+        tasks = [asyncio.ensure_future(resolve(name)) for name in test_domains]
+        answered = []
+        misses = 0
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                ips = await next_done
+                if not ips:
+                    misses += 1
+                    if misses >= 2:
+                        return set()
+                    continue
+                
+                agreeing = [other for other in answered if other & ips]
+                answered.append(ips)
+                if agreeing:
+                    return ips.union(*agreeing)
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        return set().union(*answered)
+    
+    def _is_wildcard_response(self, domain: str, response_ips: List[str]) -> bool:
+        """Check if a non-empty answer only contains the domain's wildcard IPs"""
+        wildcard_ips = self._wildcard_ips.get(domain)
+        return bool(wildcard_ips) and bool(response_ips) and set(response_ips) <= wildcard_ips
     
     def _reverse_dns_lookup(self, ip: str) -> Dict:
         """Perform reverse DNS lookup on IP"""
-        print(f"{Colors.YELLOW}🔄 Reverse DNS lookup for {ip}...{Colors.END}")
+        self._say(f"{Colors.YELLOW}🔄 Reverse DNS lookup for {ip}...{Colors.END}")
         
         try:
-            result = subprocess.run([
-                'dig', '-x', ip, '+short'
-            ], capture_output=True, text=True, timeout=10)
+            ptr_records = self._ptr_records(ip)
             
-            if result.returncode == 0 and result.stdout.strip():
-                ptr_records = result.stdout.strip().split('\n')
-                ptr_records = [ptr.rstrip('.') for ptr in ptr_records if ptr.strip()]
-                
-                if ptr_records:
-                    print(f"{Colors.GREEN}   ✅ PTR records: {ptr_records}{Colors.END}")
-                    return {'success': True, 'ptr_records': ptr_records}
+            if ptr_records:
+                self._say(f"{Colors.GREEN}   ✅ PTR records: {ptr_records}{Colors.END}")
+                return {'success': True, 'ptr_records': ptr_records}
             
-            print(f"{Colors.YELLOW}   ℹ️  No PTR records found{Colors.END}")
+            self._say(f"{Colors.YELLOW}   ℹ️  No PTR records found{Colors.END}")
             return {'success': False, 'ptr_records': []}
             
         except Exception as e:
-            print(f"{Colors.YELLOW}   ⚠️  Reverse DNS failed: {str(e)}{Colors.END}")
+            self._say(f"{Colors.YELLOW}   ⚠️  Reverse DNS failed: {str(e)}{Colors.END}")
             return {'success': False, 'error': str(e)}
     
+    def _ptr_records(self, ip: str) -> List[str]:
+        """Look up PTR names for an IP in-process ([] if it has none)
+        
+        dnspython returns every PTR record; otherwise the system resolver's
+        getnameinfo gives the primary name, run on a worker thread so the
+        lookup can be bounded like the others.
+        """
+        if self._resolver:
+            try:
+                answer = self._resolver.resolve_address(ip, lifetime=10)
+            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+                return []
+            return [record.to_text().rstrip('.') for record in answer]
+        
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            host, _ = executor.submit(socket.getnameinfo, (ip, 0), socket.NI_NAMEREQD).result(timeout=10)
+        except socket.gaierror:
+            return []
+        finally:
+            executor.shutdown(wait=False)
+        return [host]
+    
     def _save_dns_results(self, results: Dict, run_command_func) -> None:
-        """Save DNS enumeration results to file"""
+        """Save DNS enumeration results to file
+        
+        The summary and the raw JSON are written straight to the file rather
+        than assembled in memory first, which matters for large zone transfers.
+        """
         try:
             import json
             
-            # Create a readable summary
-            summary = [
-                "DNS Enumeration Results",
-                "=" * 50,
-                ""
-            ]
-            
-            # Zone Transfer Results
-            if results['zone_transfers']:
-                summary.append("ZONE TRANSFER RESULTS:")
-                summary.append("-" * 25)
-                for domain, zt_result in results['zone_transfers'].items():
-                    if zt_result['success']:
-                        summary.append(f"✅ {domain}: {zt_result['count']} subdomains from zone transfer")
-                        for subdomain in zt_result['subdomains']:
-                            summary.append(f"   - {subdomain}")
-                    else:
-                        summary.append(f"❌ {domain}: {zt_result['reason']}")
-                summary.append("")
-            
-            # Discovered Subdomains
-            if results['subdomains']:
-                summary.append("DISCOVERED SUBDOMAINS:")
-                summary.append("-" * 25)
-                for subdomain in sorted(results['subdomains']):
-                    summary.append(f"   - {subdomain}")
-                summary.append("")
-            
-            # DNS Records
-            if results['dns_records']:
-                summary.append("DNS RECORDS:")
-                summary.append("-" * 15)
-                for domain, records in results['dns_records'].items():
-                    summary.append(f"{domain}:")
-                    for record_type, values in records.items():
-                        summary.append(f"   {record_type}: {', '.join(values)}")
-                summary.append("")
-            
-            # Wildcard Detection
-            if results['wildcards']:
-                summary.append("WILDCARD DETECTION:")
-                summary.append("-" * 20)
-                for domain, wildcard_info in results['wildcards'].items():
-                    if wildcard_info['has_wildcard']:
-                        summary.append(f"⚠️  {domain}: Wildcard DNS detected ({wildcard_info['wildcard_ips']})")
-                    else:
-                        summary.append(f"✅ {domain}: No wildcard DNS")
-                summary.append("")
-            
-            # Raw JSON data
-            summary.append("RAW DATA (JSON):")
-            summary.append("-" * 18)
-            summary.append(json.dumps(results, indent=2, default=str))
-            
-            # Write to file
-            with open('dns_enumeration.txt', 'w') as f:
-                f.write('\n'.join(summary))
+            with open('dns_enumeration.txt', 'w', buffering=1 << 20) as f:
+                write = f.write
+                
+                write("DNS Enumeration Results\n")
+                write("=" * 50 + "\n")
+                write("\n")
+                
+                # Zone Transfer Results
+                if results['zone_transfers']:
+                    write("ZONE TRANSFER RESULTS:\n")
+                    write("-" * 25 + "\n")
+                    for domain, zt_result in results['zone_transfers'].items():
+                        if zt_result['success']:
+                            write(f"✅ {domain}: {zt_result['count']} subdomains from zone transfer\n")
+                            for subdomain in zt_result['subdomains']:
+                                write(f"   - {subdomain}\n")
+                        else:
+                            write(f"❌ {domain}: {zt_result['reason']}\n")
+                    write("\n")
+                
+                # Discovered Subdomains
+                if results['subdomains']:
+                    write("DISCOVERED SUBDOMAINS:\n")
+                    write("-" * 25 + "\n")
+                    for subdomain in sorted(results['subdomains']):
+                        write(f"   - {subdomain}\n")
+                    write("\n")
+                
+                # DNS Records
+                if results['dns_records']:
+                    write("DNS RECORDS:\n")
+                    write("-" * 15 + "\n")
+                    for domain, records in results['dns_records'].items():
+                        write(f"{domain}:\n")
+                        for record_type, values in records.items():
+                            write(f"   {record_type}: {', '.join(values)}\n")
+                    write("\n")
+                
+                # Wildcard Detection
+                if results['wildcards']:
+                    write("WILDCARD DETECTION:\n")
+                    write("-" * 20 + "\n")
+                    for domain, wildcard_info in results['wildcards'].items():
+                        if wildcard_info['has_wildcard']:
+                            write(f"⚠️  {domain}: Wildcard DNS detected ({wildcard_info['wildcard_ips']})\n")
+                        else:
+                            write(f"✅ {domain}: No wildcard DNS\n")
+                    write("\n")
+                
+                # Raw JSON data
+                write("RAW DATA (JSON):\n")
+                write("-" * 18 + "\n")
+                json.dump(results, f, indent=2, default=str)
             
             print(f"{Colors.GREEN}📄 DNS enumeration results saved to dns_enumeration.txt{Colors.END}")
             
@@ -9,10 +9,134 @@ import re
 import subprocess
 import tempfile
 import shutil
-from typing import List, Dict, Tuple, Optional
+import socket
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Set, Tuple, Optional
 from pathlib import Path
+import requests
+import urllib3
 from ..ui.colors import Colors
 
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows - hosts file appends go unlocked there
+    fcntl = None
+
+
+# Domain discovery patterns, compiled once and shared by every scan
+
+# Everything looked for in a response body, as one pattern so the body is
+# scanned once; the named group that matched says what was found:
+#   link  - host of an absolute href/src/action URL
+#   title - CTF domain named in the page <title>
+#   tld   - any common HTB/CTF domain (*.htb, TryHackMe *.thm, *.local, *.box)
+# link and title sit in lookaheads so they don't consume the text, leaving
+# the same names for the tld branch as when each pattern ran on its own.
+# tld only starts where a label run begins, or straight after a CTF TLD
+# (where the previous tld match ended, e.g. 'host.htb' in 'sub.localhost.htb').
+# Retrying anywhere else inside a run of letters can never match and made
+# scanning such bodies quadratic; the names found are unchanged
+_BODY_RE = re.compile(
+    r'(?=(?:href|src|action)=["\']https?://(?P<link>[a-zA-Z0-9.-]+)["\'])'
+    r'|(?=<title>.*?(?P<title>[a-zA-Z0-9-]+\.(?:htb|thm|local|box)).*?</title>)'
+    r'|(?:(?<![a-zA-Z0-9-])|(?<=\.htb|\.thm|\.box)|(?<=\.local))'
+    r'(?P<tld>[a-zA-Z0-9-]+\.(?:htb|thm|local|box))',
+    re.IGNORECASE
+)
+
+# Hosts named in HTTP response headers, in a single pass; exactly one
+# group takes part in each match
+_HEADER_RE = re.compile(
+    r'Location:\s*https?://(?P<location>[a-zA-Z0-9.-]+)'              # Enhanced Location pattern
+    r'|Location:\s*(?P<location_htb>[a-zA-Z0-9.-]+\.(?:htb|thm|local|box))'  # HTB-specific in Location
+    r'|Server:\s*(?P<server>[a-zA-Z0-9.-]+)'
+    r'|Host:\s*(?P<host>[a-zA-Z0-9.-]+)',
+    re.IGNORECASE
+)
+
+# Domains in whatweb's verbose output - HTB optimized patterns, in a single
+# pass. Every branch is a lookahead, so a long Title[...] or content match
+# doesn't hide a domain inside it from the branches that start there; where
+# two branches start at the same place the earlier, more specific one wins
+_CTF_DOMAIN = r'[a-zA-Z0-9.-]+\.(?:htb|thm|local|box)'
+_WHATWEB_RE = re.compile(
+    # HTB/CTF specific patterns (highest priority)
+    rf'(?=RedirectLocation\[(?P<redirect_ctf>{_CTF_DOMAIN})[/\]])'
+    rf'|(?=Location:\s*https?://(?P<location_ctf>{_CTF_DOMAIN}))'
+    rf'|(?=Host:\s*(?P<host_ctf>{_CTF_DOMAIN}))'
+    r'|(?=Title\[.*?(?P<title>[a-zA-Z0-9-]+\.(?:htb|thm|local|box)).*?\])'
+    # Generic redirect patterns (lower priority)
+    r'|(?=RedirectLocation\[https?://(?P<redirect>[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})[/\]])'
+    r'|(?=Location:\s*https?://(?P<location>[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}))'
+    # Server and host patterns
+    r'|(?=Host:\s*(?P<host>[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}))'
+    rf'|(?=Server:\s*(?P<server>{_CTF_DOMAIN}))'
+    # Content-based patterns for HTB
+    r'|(?=(?:content|href|src)["\'].*?(?P<content>[a-zA-Z0-9-]+\.htb))',
+    re.IGNORECASE
+)
+
+# Words marking the header / whatweb lines worth echoing for debugging
+_HEADER_KEYWORDS = ('location', 'host', 'server')
+_WHATWEB_KEYWORDS = ('location', 'redirect', 'host', '.htb', '.thm', '.local', '.box')
+
+# Only the start of a response body is scanned; CTF names turn up in the
+# title, head and navigation, and a misbehaving server may send gigabytes
+_MAX_BODY_BYTES = 2 * 1024 * 1024
+
+# whatweb gives up on each target on its own; the overall limit grows with
+# the number of targets in the batch so one slow port can't sink the rest
+_WHATWEB_OPEN_TIMEOUT = 10
+_WHATWEB_READ_TIMEOUT = 20
+_WHATWEB_TIMEOUT_PER_TARGET = 30
+
+# Characters allowed in a hostname written to /etc/hosts
+_HOSTNAME_CHARS = (string.ascii_letters + string.digits + '.-').encode()
+
+# Public TLDs never worth adding to /etc/hosts
+_PUBLIC_TLDS = frozenset({'com', 'org', 'net', 'gov', 'edu', 'io'})
+
+
+def _looks_like_ipv4(value: str) -> bool:
+    """Whether value is a dotted quad of digits (no regex engine entry)"""
+    return value.count('.') == 3 and all(part.isdigit() for part in value.split('.'))
+
+
+def _valid_hostname_chars(name: str) -> bool:
+    """Whether name uses only hostname characters (one C-level translate)"""
+    return not name.encode().translate(None, _HOSTNAME_CHARS)
+
+
+def _accept_domain(domain: str) -> bool:
+    """Whether an extracted name is a plausible target domain"""
+    return (len(domain) > 3 and
+            '.' in domain and
+            not domain.startswith('.') and
+            not domain.endswith('.') and
+            domain.rsplit('.', 1)[-1].lower() not in _PUBLIC_TLDS and
+            not _looks_like_ipv4(domain))
+
+
+def _domain_sort_key(domain: str) -> Tuple[bool, bool, bool, bool]:
+    """Priority order for domain selection (lower sorts first)"""
+    return (
+        not domain.endswith('.htb'),                        # HTB domains first
+        domain.startswith('www.'),                          # Non-www domains
+        domain.count('.') != 1,                             # Simple domains
+        not ('machine' in domain or 'target' in domain),    # Common names
+    )
+
+
+# Tool availability doesn't change during a run, so it's checked once per process
+@lru_cache(maxsize=None)
+def _tool_available(tool: str) -> bool:
+    """Check whether a tool is on PATH (no subprocess needed)"""
+    return shutil.which(tool) is not None
+
 
 class DomainManager:
     """Manages domain discovery and /etc/hosts manipulation"""
@@ -25,10 +149,49 @@ class DomainManager:
         self.backup_hosts = None
         self.hosts_entries_added = []
         
+        # HTTP client for domain discovery, created on first use (see session)
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        
+        # Discovery results per set of service URLs, and per URL the ETag of
+        # the last response with the domains and lines it produced
+        self._discover_cache: Dict[Tuple[str, ...], List[str]] = {}
+        self._http_cache: Dict[str, Tuple[str, Set[str], List[str]]] = {}
+        
         # Test sudo availability if use_sudo is enabled
         if self.use_sudo:
             self._check_sudo_availability()
     
+    @property
+    def session(self) -> requests.Session:
+        """Shared HTTP session, created on first use
+        
+        Keep-alive connections (and their TLS sessions) are pooled and reused
+        by every request this manager makes. Certificates aren't checked
+        (like curl -k).
+        """
+        with self._session_lock:
+            if self._session is None:
+                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+                session = requests.Session()
+                session.headers.update({
+                    'User-Agent': 'ipsnipe/2.1 (HTB Scanner)',
+                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                })
+                # Room for every concurrent discovery worker to keep a connection
+                adapter = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+    
+    def close(self):
+        """Release pooled HTTP connections"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+    
     def _check_sudo_availability(self):
         """Check if sudo is available and working"""
         try:
@@ -47,105 +210,26 @@ class DomainManager:
         """Discover domain names from HTTP responses and headers"""
         print(f"{Colors.YELLOW}🔍 Discovering domain names from web services...{Colors.END}")
         
+        # Same services as an earlier call - nothing new to fetch
+        cache_key = tuple(sorted(service['url'] for service in web_services))
+        if cache_key in self._discover_cache:
+            valid_domains = self._discover_cache[cache_key]
+            print(f"{Colors.CYAN}💾 Using cached domain discovery results: {valid_domains}{Colors.END}")
+            return list(valid_domains)
+        
         domains = set()
         
-        for service in web_services:
-            url = service['url']
-            print(f"{Colors.CYAN}   Checking {url} for domain names...{Colors.END}")
-            
-            try:
-                # Get full HTTP response including body
-                result = subprocess.run([
-                    'curl', '-s', '-L', '--max-time', '10', '--connect-timeout', '5',
-                    '-k', '--user-agent', 'ipsnipe/2.1 (HTB Scanner)',
-                    '-H', 'Accept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    url
-                ], capture_output=True, text=True, timeout=15)
-                
-                if result.returncode == 0:
-                    # Look for domains in various places
-                    content = result.stdout
-                    
-                    # 1. Look for common HTB/CTF patterns
-                    htb_patterns = [
-                        r'([a-zA-Z0-9-]+\.htb)',  # *.htb domains
-                        r'([a-zA-Z0-9-]+\.thm)',  # TryHackMe domains
-                        r'([a-zA-Z0-9-]+\.local)', # .local domains
-                        r'([a-zA-Z0-9-]+\.box)',   # .box domains
-                    ]
-                    
-                    for pattern in htb_patterns:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        for match in matches:
-                            domains.add(match.lower())
-                    
-                    # 2. Look for domains in HTML content
-                    html_patterns = [
-                        r'href=["\']https?://([a-zA-Z0-9.-]+)["\']',
-                        r'src=["\']https?://([a-zA-Z0-9.-]+)["\']',
-                        r'action=["\']https?://([a-zA-Z0-9.-]+)["\']',
-                        r'<title>.*?([a-zA-Z0-9-]+\.(?:htb|thm|local|box)).*?</title>',
-                    ]
-                    
-                    for pattern in html_patterns:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        for match in matches:
-                            # Filter out IP addresses and common domains
-                            if not re.match(r'\d+\.\d+\.\d+\.\d+', match) and \
-                               not match.endswith(('.com', '.org', '.net', '.gov', '.edu')):
-                                domains.add(match.lower())
-                    
-                    # 3. Get HTTP headers for more clues
-                    header_result = subprocess.run([
-                        'curl', '-s', '-I', '--max-time', '5', '--connect-timeout', '3',
-                        '-k', url
-                    ], capture_output=True, text=True, timeout=8)
-                    
-                    if header_result.returncode == 0:
-                        headers = header_result.stdout
-                        print(f"{Colors.CYAN}   📄 HTTP Headers received for {url}{Colors.END}")
-                        
-                        # Look for domains in headers - enhanced patterns
-                        header_patterns = [
-                            r'Location:\s*https?://([a-zA-Z0-9.-]+)(?:/.*)?',  # Enhanced Location pattern
-                            r'Location:\s*([a-zA-Z0-9.-]+\.(?:htb|thm|local|box))(?:/.*)?',  # HTB-specific in Location
-                            r'Server:\s*([a-zA-Z0-9.-]+)',
-                            r'Host:\s*([a-zA-Z0-9.-]+)',
-                        ]
-                        
-                        for pattern in header_patterns:
-                            matches = re.findall(pattern, headers, re.IGNORECASE)
-                            for match in matches:
-                                # More permissive domain validation
-                                if (not re.match(r'^\d+\.\d+\.\d+\.\d+$', match) and 
-                                    '.' in match and 
-                                    len(match) > 3 and
-                                    not match.endswith(('.com', '.org', '.net', '.gov', '.edu'))):
-                                    domains.add(match.lower())
-                                    print(f"{Colors.GREEN}   🎯 Found domain in headers: {match.lower()}{Colors.END}")
-                        
-                        # Debug: Show what headers we got
-                        if any(word in headers.lower() for word in ['location', 'host', 'server']):
-                            print(f"{Colors.CYAN}   🔍 Relevant headers found:{Colors.END}")
-                            for line in headers.split('\n'):
-                                if any(word in line.lower() for word in ['location', 'host', 'server']):
-                                    print(f"      {line.strip()}")
-                    else:
-                        print(f"{Colors.YELLOW}   ⚠️  No HTTP headers received from {url}{Colors.END}")
-                
-            except Exception as e:
-                print(f"{Colors.YELLOW}   ⚠️  Could not analyze {url}: {str(e)}{Colors.END}")
+        # Services are independent, so they are all checked at once; each
+        # one's output is collected and printed as a block, in service order
+        if web_services:
+            urls = [service['url'] for service in web_services]
+            with ThreadPoolExecutor(max_workers=min(len(urls), 16)) as executor:
+                for found, lines in executor.map(self._analyze_http_service, urls):
+                    print('\n'.join(lines))
+                    domains.update(found)
         
-        # Filter and validate domains
-        valid_domains = []
-        for domain in domains:
-            # Basic validation
-            if (len(domain) > 3 and 
-                '.' in domain and 
-                not domain.startswith('.') and 
-                not domain.endswith('.') and
-                not re.match(r'^\d+\.\d+\.\d+\.\d+$', domain)):
-                valid_domains.append(domain)
+        # Everything was validated as it was found
+        valid_domains = list(domains)
         
         if valid_domains:
             print(f"{Colors.GREEN}🌐 Discovered domains: {valid_domains}{Colors.END}")
@@ -154,88 +238,158 @@ class DomainManager:
             print(f"{Colors.CYAN}💡 Only actual discovered domains will be added to hosts file{Colors.END}")
         
         self.discovered_domains.update(valid_domains)
+        self._discover_cache[cache_key] = list(valid_domains)
         return valid_domains
     
+    def _analyze_http_service(self, url: str) -> Tuple[Set[str], List[str]]:
+        """Look for domain names in one web service's response and headers
+        
+        Returns the domains found and the progress lines to print.
+        """
+        domains = set()
+        lines = []
+        say = lines.append
+        
+        say(f"{Colors.CYAN}   Checking {url} for domain names...{Colors.END}")
+        
+        try:
+            # Get full HTTP response including body, revalidating any copy
+            # analysed before
+            cached = self._http_cache.get(url)
+            response = self.session.get(
+                url, timeout=(5, 10), verify=False, allow_redirects=True,
+                headers={'If-None-Match': cached[0]} if cached else None,
+                stream=True
+            )
+            content = self._read_body(response)
+            
+            if cached and response.status_code == 304:
+                say(f"{Colors.CYAN}   💾 {url} unchanged since last check{Colors.END}")
+                lines.extend(cached[2])
+                return set(cached[1]), lines
+            
+            # Look for domains in various places
+            # 1-2. Common HTB/CTF names and hosts referenced from the HTML,
+            # in a single pass over the body
+            for body_match in _BODY_RE.finditer(content):
+                match = body_match.group(body_match.lastgroup)
+                # Filter out IP addresses and common domains
+                if _accept_domain(match):
+                    domains.add(match.lower())
+            
+            # 3. HTTP headers for more clues - from every response along the
+            # way, so redirect Locations are seen as well as the final headers
+            headers = ''.join(
+                f"{name}: {value}\n"
+                for hop in (*response.history, response)
+                for name, value in hop.headers.items()
+            )
+            say(f"{Colors.CYAN}   📄 HTTP Headers received for {url}{Colors.END}")
+            
+            # Look for domains in headers - enhanced patterns
+            for header_match in _HEADER_RE.finditer(headers):
+                match = header_match.group(header_match.lastindex)
+                if _accept_domain(match):
+                    domains.add(match.lower())
+                    say(f"{Colors.GREEN}   🎯 Found domain in headers: {match.lower()}{Colors.END}")
+            
+            # Debug: Show what headers we got (lowercased once, line by
+            # line alongside the original)
+            headers_lower = headers.lower()
+            if any(word in headers_lower for word in _HEADER_KEYWORDS):
+                say(f"{Colors.CYAN}   🔍 Relevant headers found:{Colors.END}")
+                for line, line_lower in zip(headers.splitlines(), headers_lower.splitlines()):
+                    if any(word in line_lower for word in _HEADER_KEYWORDS):
+                        say(f"      {line.strip()}")
+            
+            etag = response.headers.get('ETag')
+            if etag:
+                self._http_cache[url] = (etag, set(domains), lines[1:])
+            
+        except requests.RequestException as e:
+            say(f"{Colors.YELLOW}   ⚠️  No HTTP response from {url} ({type(e).__name__}){Colors.END}")
+        except Exception as e:
+            say(f"{Colors.YELLOW}   ⚠️  Could not analyze {url}: {str(e)}{Colors.END}")
+        
+        return domains, lines
+    
+    def _read_body(self, response: requests.Response) -> str:
+        """Read a streamed response body, up to _MAX_BODY_BYTES"""
+        body = bytearray()
+        try:
+            for chunk in response.iter_content(65536):
+                body += chunk
+                if len(body) >= _MAX_BODY_BYTES:
+                    break
+        finally:
+            response.close()
+        return body[:_MAX_BODY_BYTES].decode(response.encoding or 'utf-8', errors='replace')
+    
     def discover_domains_with_whatweb(self, target_ip: str, web_ports: List[int]) -> List[str]:
         """Use whatweb to discover domains from HTTP headers and redirects"""
         print(f"{Colors.YELLOW}🔍 Using whatweb to discover domains from HTTP headers...{Colors.END}")
         
         discovered_domains = set()
         
-        for port in web_ports:
+        if web_ports and not _tool_available('whatweb'):
+            print(f"{Colors.YELLOW}   ⚠️  whatweb not installed - skipping whatweb domain discovery{Colors.END}")
+        elif web_ports:
             # Determine protocol
-            protocol = 'https' if port in [443, 8443] else 'http'
-            url = f"{protocol}://{target_ip}:{port}"
+            urls = [f"{'https' if port in [443, 8443] else 'http'}://{target_ip}:{port}"
+                    for port in web_ports]
             
-            print(f"{Colors.CYAN}   Analyzing {url} with whatweb...{Colors.END}")
+            print(f"{Colors.CYAN}   Analyzing {', '.join(urls)} with whatweb...{Colors.END}")
             
             try:
-                # Run whatweb with verbose output to get headers
+                # Run whatweb with verbose output to get headers. All ports go
+                # to one process: whatweb scans its targets concurrently and
+                # Ruby only starts once
                 command = [
                     'whatweb',
                     '--log-verbose=-',  # Verbose output to stdout
                     '--aggression=3',   # More aggressive for better header detection
                     '--no-errors',
                     '--max-redirects=5',  # Follow redirects to catch domain changes
-                    url
+                    f'--open-timeout={_WHATWEB_OPEN_TIMEOUT}',
+                    f'--read-timeout={_WHATWEB_READ_TIMEOUT}',
+                    *urls
                 ]
                 
-                result = subprocess.run(command, capture_output=True, text=True, timeout=30)
+                # Raw bytes: whatweb echoes page titles and headers verbatim,
+                # which needn't be valid in the locale encoding
+                try:
+                    result = subprocess.run(command, capture_output=True,
+                                            timeout=_WHATWEB_TIMEOUT_PER_TARGET * len(urls))
+                    stdout = result.stdout if result.returncode == 0 else None
+                except subprocess.TimeoutExpired as e:
+                    # Keep whatever whatweb reported for the targets it finished
+                    print(f"{Colors.YELLOW}   ⚠️  Whatweb timed out - using partial output{Colors.END}")
+                    stdout = e.stdout
                 
-                if result.returncode == 0 and result.stdout:
-                    output = result.stdout
+                if stdout:
+                    output = stdout.decode('utf-8', errors='replace')
                     
                     # Parse whatweb output for domains - HTB optimized patterns
-                    domain_patterns = [
-                        # HTB/CTF specific patterns (highest priority)
-                        r'RedirectLocation\[([a-zA-Z0-9.-]+\.htb)[/\]]',
-                        r'Location:\s*https?://([a-zA-Z0-9.-]+\.htb)',
-                        r'Host:\s*([a-zA-Z0-9.-]+\.htb)',
-                        r'Title\[.*?([a-zA-Z0-9-]+\.htb).*?\]',
-                        
-                        # Other CTF platforms
-                        r'RedirectLocation\[([a-zA-Z0-9.-]+\.(?:thm|local|box))[/\]]',
-                        r'Location:\s*https?://([a-zA-Z0-9.-]+\.(?:thm|local|box))',
-                        r'Host:\s*([a-zA-Z0-9.-]+\.(?:thm|local|box))',
-                        r'Title\[.*?([a-zA-Z0-9-]+\.(?:thm|local|box)).*?\]',
-                        
-                        # Generic redirect patterns (lower priority)
-                        r'RedirectLocation\[https?://([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})[/\]]',
-                        r'Location:\s*https?://([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                        
-                        # Server and host patterns
-                        r'Host:\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                        r'Server:\s*([a-zA-Z0-9.-]+\.(?:htb|thm|local|box))',
-                        
-                        # Content-based patterns for HTB
-                        r'content["\'].*?([a-zA-Z0-9-]+\.htb)',
-                        r'href["\'].*?([a-zA-Z0-9-]+\.htb)',
-                        r'src["\'].*?([a-zA-Z0-9-]+\.htb)',
-                    ]
-                    
-                    for pattern in domain_patterns:
-                        matches = re.findall(pattern, output, re.IGNORECASE)
-                        for match in matches:
-                            # Validate domain
-                            if (not re.match(r'^\d+\.\d+\.\d+\.\d+$', match) and 
-                                '.' in match and 
-                                len(match) > 3 and
-                                not match.endswith(('.com', '.org', '.net', '.gov', '.edu', '.io'))):
-                                discovered_domains.add(match.lower())
-                                print(f"{Colors.GREEN}   🎯 Found domain in whatweb output: {match.lower()}{Colors.END}")
+                    for domain_match in _WHATWEB_RE.finditer(output):
+                        match = domain_match.group(domain_match.lastgroup)
+                        # Validate domain
+                        if _accept_domain(match):
+                            discovered_domains.add(match.lower())
+                            print(f"{Colors.GREEN}   🎯 Found domain in whatweb output: {match.lower()}{Colors.END}")
                     
                     # Debug: Show relevant parts of whatweb output
-                    if any(keyword in output.lower() for keyword in ['location', 'redirect', 'host', '.htb', '.thm', '.local', '.box']):
+                    output_lower = output.lower()
+                    if any(keyword in output_lower for keyword in _WHATWEB_KEYWORDS):
                         print(f"{Colors.CYAN}   📄 Relevant whatweb output:{Colors.END}")
-                        for line in output.split('\n'):
-                            if any(keyword in line.lower() for keyword in ['location', 'redirect', 'host', '.htb', '.thm', '.local', '.box']):
+                        for line, line_lower in zip(output.splitlines(), output_lower.splitlines()):
+                            if any(keyword in line_lower for keyword in _WHATWEB_KEYWORDS):
                                 print(f"      {line.strip()}")
                 
                 else:
-                    print(f"{Colors.YELLOW}   ⚠️  Whatweb scan failed for {url}{Colors.END}")
+                    print(f"{Colors.YELLOW}   ⚠️  Whatweb scan failed for {', '.join(urls)}{Colors.END}")
                     
             except Exception as e:
-                print(f"{Colors.YELLOW}   ⚠️  Error running whatweb on {url}: {str(e)}{Colors.END}")
+                print(f"{Colors.YELLOW}   ⚠️  Error running whatweb: {str(e)}{Colors.END}")
         
         valid_domains = list(discovered_domains)
         
@@ -246,7 +400,6 @@ class DomainManager:
         
         self.discovered_domains.update(valid_domains)
         return valid_domains
-
     
     def backup_hosts_file(self) -> bool:
         """Create a backup of the current /etc/hosts file"""
@@ -286,17 +439,34 @@ class DomainManager:
         print(f"{Colors.YELLOW}🔧 Adding domains to /etc/hosts...{Colors.END}")
         
         try:
-            # Read current hosts file
+            ipsnipe_marker = "# ipsnipe entries"
+            
+            # Stream the current hosts file once, indexing existing
+            # (ip, hostname) mappings (ignoring comments) and noting whether
+            # our marker is already there
+            existing = set()
+            marker_present = False
             with open(self.hosts_file, 'r') as f:
-                current_content = f.read()
+                for line in f:
+                    if ipsnipe_marker in line:
+                        marker_present = True
+                    fields = line.split('#', 1)[0].split()
+                    for hostname in fields[1:]:
+                        existing.add((fields[0], hostname.lower()))
             
             # Prepare new entries
             new_entries = []
-            ipsnipe_marker = "# ipsnipe entries"
             
             for domain in domains:
-                entry = f"{self.target_ip}\t{domain}"
-                if entry not in current_content:
+                # Whitespace or wildcard/SRV names would corrupt or pollute
+                # the hosts file
+                if not _valid_hostname_chars(domain):
+                    print(f"{Colors.YELLOW}⚠️  Skipping invalid hostname: {domain!r}{Colors.END}")
+                    continue
+                key = (self.target_ip, domain.lower())
+                if key not in existing:
+                    existing.add(key)
+                    entry = f"{self.target_ip}\t{domain}"
                     new_entries.append(entry)
                     self.hosts_entries_added.append(entry)
             
@@ -304,37 +474,31 @@ class DomainManager:
                 print(f"{Colors.YELLOW}ℹ️  All domains already in hosts file{Colors.END}")
                 return True
             
+            # Build the whole appended block up front so it lands in one write
+            block = ''
+            if not marker_present:
+                block += f"\n{ipsnipe_marker}\n"
+            block += '\n'.join(new_entries) + '\n'
+            
             if self.use_sudo:
                 # Use sudo to modify hosts file
-                return self._add_entries_with_sudo(new_entries, ipsnipe_marker, current_content)
+                return self._add_entries_with_sudo(new_entries, block)
             else:
                 # Try direct modification first
-                return self._add_entries_direct(new_entries, ipsnipe_marker, current_content)
+                return self._add_entries_direct(new_entries, block)
             
         except Exception as e:
             print(f"{Colors.RED}❌ Failed to update hosts file: {str(e)}{Colors.END}")
             return False
     
-    def _add_entries_with_sudo(self, new_entries: List[str], marker: str, current_content: str) -> bool:
+    def _add_entries_with_sudo(self, new_entries: List[str], block: str) -> bool:
         """Add entries to hosts file using sudo"""
         try:
-            # Create temporary file with new content
-            temp_file = f"/tmp/ipsnipe_hosts_{os.getpid()}"
-            
-            with open(temp_file, 'w') as f:
-                f.write(current_content)
-                if marker not in current_content:
-                    f.write(f"\n{marker}\n")
-                for entry in new_entries:
-                    f.write(f"{entry}\n")
-            
-            # Use sudo to copy temp file to hosts file
+            # Append the block through sudo tee - no temp file, and the
+            # existing content is never read back or copied
             result = subprocess.run([
-                'sudo', 'cp', temp_file, self.hosts_file
-            ], capture_output=True, text=True)
-            
-            # Clean up temp file
-            os.remove(temp_file)
+                'sudo', 'tee', '-a', self.hosts_file
+            ], input=block, capture_output=True, text=True)
             
             if result.returncode == 0:
                 print(f"{Colors.GREEN}✅ Added {len(new_entries)} domain(s) to /etc/hosts:{Colors.END}")
@@ -351,15 +515,20 @@ class DomainManager:
             self._show_manual_instructions(new_entries)
             return False
     
-    def _add_entries_direct(self, new_entries: List[str], marker: str, current_content: str) -> bool:
+    def _add_entries_direct(self, new_entries: List[str], block: str) -> bool:
         """Add entries to hosts file directly (without sudo)"""
         try:
-            # Add entries to hosts file
+            # Append the block in a single write, holding an exclusive lock
+            # so concurrent writers can't interleave with it
             with open(self.hosts_file, 'a') as f:
-                if marker not in current_content:
-                    f.write(f"\n{marker}\n")
-                for entry in new_entries:
-                    f.write(f"{entry}\n")
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    f.write(block)
+                    f.flush()
+                finally:
+                    if fcntl:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
             
             print(f"{Colors.GREEN}✅ Added {len(new_entries)} domain(s) to /etc/hosts:{Colors.END}")
             for entry in new_entries:
@@ -386,48 +555,47 @@ class DomainManager:
         print(f"{Colors.YELLOW}🔍 Verifying domain resolution...{Colors.END}")
         
         working_domains = []
+        if not domains:
+            return working_domains
+        
+        # Lookups are independent, so run them side by side - one per
+        # distinct name, as callers may pass the same domain more than once
+        unique_domains = list(dict.fromkeys(domains))
+        with ThreadPoolExecutor(max_workers=min(32, len(unique_domains))) as executor:
+            results = dict(zip(unique_domains, executor.map(self._resolve_one, unique_domains)))
         
+        # Report in input order
         for domain in domains:
-            try:
-                # Use nslookup or dig to verify resolution
-                result = subprocess.run([
-                    'nslookup', domain
-                ], capture_output=True, text=True, timeout=5)
-                
-                if result.returncode == 0 and self.target_ip in result.stdout:
-                    working_domains.append(domain)
-                    print(f"{Colors.GREEN}   ✅ {domain} resolves to {self.target_ip}{Colors.END}")
-                else:
-                    print(f"{Colors.YELLOW}   ⚠️  {domain} resolution unclear{Colors.END}")
-                    # Still add it as it might work
-                    working_domains.append(domain)
-                    
-            except Exception:
-                # If nslookup fails, assume it might still work
-                working_domains.append(domain)
+            resolved = results[domain]
+            if resolved:
+                print(f"{Colors.GREEN}   ✅ {domain} resolves to {self.target_ip}{Colors.END}")
+            elif resolved is not None:
+                print(f"{Colors.YELLOW}   ⚠️  {domain} resolution unclear{Colors.END}")
+            # Still add it as it might work
+            working_domains.append(domain)
         
         return working_domains
     
+    def _resolve_one(self, domain: str) -> Optional[bool]:
+        """Whether domain resolves to the target IP (None if the lookup errored)"""
+        try:
+            # In-process resolver honours /etc/hosts, no nslookup fork
+            _, _, addresses = socket.gethostbyname_ex(domain)
+            return self.target_ip in addresses
+        except (socket.gaierror, socket.herror):
+            return False
+        except Exception:
+            # If the lookup itself fails, assume it might still work
+            return None
+    
     def get_best_domain(self, domains: List[str]) -> Optional[str]:
         """Get the best domain to use for scanning"""
         if not domains:
             return None
         
-        # Priority order for domain selection
-        priorities = [
-            lambda d: d.endswith('.htb'),      # HTB domains first
-            lambda d: not d.startswith('www.'), # Non-www domains
-            lambda d: len(d.split('.')) == 2,   # Simple domains
-            lambda d: 'machine' in d or 'target' in d,  # Common names
-        ]
-        
-        for priority_func in priorities:
-            for domain in domains:
-                if priority_func(domain):
-                    return domain
-        
-        # Return first domain if no priority matches
-        return domains[0]
+        # Single pass with the shared priority key; min() keeps the first
+        # domain on ties
+        return min(domains, key=_domain_sort_key)
     
     def cleanup_hosts_file(self):
         """Remove ipsnipe entries from hosts file
@@ -453,27 +621,10 @@ class DomainManager:
     def _cleanup_with_sudo(self):
         """Clean up hosts file using sudo"""
         try:
-            # Read current hosts file
-            with open(self.hosts_file, 'r') as f:
-                lines = f.readlines()
-            
-            # Remove ipsnipe entries
-            filtered_lines = []
-            skip_next = False
-            
-            for line in lines:
-                if "# ipsnipe entries" in line:
-                    skip_next = True
-                    continue
-                if skip_next and any(entry.strip() in line.strip() for entry in self.hosts_entries_added):
-                    continue
-                skip_next = False
-                filtered_lines.append(line)
-            
-            # Write to temp file
+            # Stream the filtered hosts file into a temp file
             temp_file = f"/tmp/ipsnipe_hosts_cleanup_{os.getpid()}"
-            with open(temp_file, 'w') as f:
-                f.writelines(filtered_lines)
+            with open(self.hosts_file, 'r') as fin, open(temp_file, 'w') as fout:
+                fout.writelines(self._filter_ipsnipe_lines(fin))
             
             # Use sudo to copy temp file to hosts file
             result = subprocess.run([
@@ -494,24 +645,20 @@ class DomainManager:
     def _cleanup_direct(self):
         """Clean up hosts file directly"""
         try:
-            with open(self.hosts_file, 'r') as f:
-                lines = f.readlines()
-            
-            # Remove ipsnipe entries
-            filtered_lines = []
-            skip_next = False
-            
-            for line in lines:
-                if "# ipsnipe entries" in line:
-                    skip_next = True
-                    continue
-                if skip_next and any(entry.strip() in line.strip() for entry in self.hosts_entries_added):
-                    continue
-                skip_next = False
-                filtered_lines.append(line)
-            
-            with open(self.hosts_file, 'w') as f:
-                f.writelines(filtered_lines)
+            # Stream into a temp file beside the hosts file, then swap it in
+            # so the hosts file is never seen half-written
+            hosts_dir = os.path.dirname(self.hosts_file) or '.'
+            with open(self.hosts_file, 'r') as fin, tempfile.NamedTemporaryFile(
+                    'w', dir=hosts_dir, prefix='.ipsnipe_hosts_', delete=False) as fout:
+                fout.writelines(self._filter_ipsnipe_lines(fin))
+            try:
+                shutil.copymode(self.hosts_file, fout.name)
+                os.replace(fout.name, self.hosts_file)
+            except OSError:
+                # e.g. a bind-mounted /etc/hosts in a container can't be
+                # renamed over - fall back to rewriting it in place
+                shutil.copyfile(fout.name, self.hosts_file)
+                os.remove(fout.name)
             
             print(f"{Colors.GREEN}✅ Cleaned up hosts file{Colors.END}")
             
@@ -521,6 +668,20 @@ class DomainManager:
         except Exception as e:
             print(f"{Colors.YELLOW}⚠️  Error during cleanup: {str(e)}{Colors.END}")
     
+    def _filter_ipsnipe_lines(self, lines):
+        """Yield hosts file lines minus the ipsnipe marker and the entries it added"""
+        entries = {entry.strip() for entry in self.hosts_entries_added}
+        skip_next = False
+        
+        for line in lines:
+            if "# ipsnipe entries" in line:
+                skip_next = True
+                continue
+            if skip_next and line.strip() in entries:
+                continue
+            skip_next = False
+            yield line
+    
     def restore_hosts_backup(self):
         """Restore hosts file from backup"""
         try:
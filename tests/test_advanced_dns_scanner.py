@@ -0,0 +1,62 @@
+"""Tests for the advanced DNS scanner"""
+
+import subprocess
+
+import pytest
+
+from ipsnipe.scanners import advanced_dns_scanner
+from ipsnipe.scanners.advanced_dns_scanner import AdvancedDNSScanner
+
+
+@pytest.fixture
+def scanner(monkeypatch, tmp_path):
+    # Keep the DNS cache out of the real home directory
+    monkeypatch.setenv('HOME', str(tmp_path))
+    scanner = AdvancedDNSScanner({})
+    yield scanner
+    scanner.close()
+
+
+def test_advanced_tools_run_with_argv_lists(monkeypatch, scanner):
+    calls = []
+    outputs = {
+        'subfinder': "dev.example.htb\nadmin.example.htb\n",
+        'dnsrecon': "[*] A mail.example.htb 10.10.10.5\n[*] A other.test 10.0.0.1\n",
+        'amass': "example.htb\napi.example.htb\nnotexample.htb\n",
+    }
+
+    def fake_run(command, **kwargs):
+        calls.append((command, kwargs))
+        return subprocess.CompletedProcess(command, 0, stdout=outputs[command[0]], stderr='')
+
+    monkeypatch.setattr(advanced_dns_scanner.subprocess, 'run', fake_run)
+    monkeypatch.setattr(scanner, '_detect_tools',
+                        lambda: {'subfinder': True, 'dnsrecon': True, 'amass': True})
+
+    results = scanner._advanced_tools_enumeration('example.htb')
+
+    assert sorted(command for command, _ in calls) == [
+        ['amass', 'enum', '-passive', '-d', 'example.htb', '-timeout', '5'],
+        ['dnsrecon', '-d', 'example.htb', '-t', 'std,brt'],
+        ['subfinder', '-d', 'example.htb', '-silent', '-t', '20'],
+    ]
+    for _, kwargs in calls:
+        assert kwargs == {'capture_output': True, 'text': True, 'timeout': 300}
+
+    assert results['tools_used'] == ['subfinder', 'dnsrecon', 'amass']
+    assert results['domains'] == {
+        'dev.example.htb', 'admin.example.htb', 'mail.example.htb',
+        'example.htb', 'api.example.htb',
+    }
+
+
+def test_advanced_tools_skip_missing_tools(monkeypatch, scanner):
+    monkeypatch.setattr(advanced_dns_scanner.subprocess, 'run',
+                        lambda *args, **kwargs: pytest.fail("no tool should be run"))
+    monkeypatch.setattr(scanner, '_detect_tools',
+                        lambda: {'subfinder': False, 'dnsrecon': False, 'amass': False})
+
+    results = scanner._advanced_tools_enumeration('example.htb')
+
+    assert results['tools_used'] == []
+    assert results['domains'] == set()
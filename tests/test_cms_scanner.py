@@ -0,0 +1,43 @@
+"""Tests for the CMS scanner"""
+
+import subprocess
+
+import pytest
+
+from ipsnipe.scanners import cms_scanner
+from ipsnipe.scanners.cms_scanner import CMSScanner
+
+
+@pytest.fixture
+def fresh_curl_probe():
+    cms_scanner._curl_supports_parallel.cache_clear()
+    yield
+    cms_scanner._curl_supports_parallel.cache_clear()
+
+
+@pytest.mark.parametrize('version, expected', [
+    ('curl 7.65.3 (x86_64-pc-linux-gnu) libcurl/7.65.3', False),
+    ('curl 7.66.0 (x86_64-pc-linux-gnu) libcurl/7.66.0', True),
+    ('curl 8.5.0 (x86_64-pc-linux-gnu) libcurl/8.5.0', True),
+])
+def test_curl_parallel_probe(monkeypatch, fresh_curl_probe, version, expected):
+    monkeypatch.setattr(cms_scanner.subprocess, 'run',
+                        lambda command, **kwargs: subprocess.CompletedProcess(command, 0, stdout=version))
+    assert cms_scanner._curl_supports_parallel() is expected
+
+
+@pytest.mark.parametrize('parallel', [True, False])
+def test_curl_fallback_saves_each_body_separately(monkeypatch, tmp_path, parallel):
+    monkeypatch.setattr(cms_scanner, '_curl_supports_parallel', lambda: parallel)
+    scanner = CMSScanner({}, str(tmp_path))
+    monkeypatch.setattr(scanner, '_check_tool_available', lambda tool: False)
+
+    command, output_file, _, scan_type = scanner._joomla_check_job('http://10.10.10.5:80')
+
+    assert scan_type == 'curl' and output_file == 'joomla_basic_http_10.10.10.5_80.txt'
+    assert ('--parallel' in command) is parallel
+    assert command[command.index('-w') + 1] == cms_scanner._CURL_WRITE_OUT
+    body_dir = tmp_path / 'joomla_basic_http_10.10.10.5_80_bodies'
+    outputs = [command[i + 1] for i, arg in enumerate(command) if arg == '-o']
+    assert outputs == [str(body_dir / name) for name in
+                       ('administrator', 'README.txt', 'configuration.php-dist')]
@@ -0,0 +1,53 @@
+"""Tests for domain discovery"""
+
+import subprocess
+import time
+
+import pytest
+
+from ipsnipe.scanners import domain_manager
+from ipsnipe.scanners.domain_manager import DomainManager
+
+
+@pytest.fixture
+def manager():
+    return DomainManager('10.10.10.1')
+
+
+def test_whatweb_timeout_scales_and_keeps_partial_output(monkeypatch, manager):
+    calls = []
+
+    def fake_run(command, **kwargs):
+        calls.append((command, kwargs))
+        raise subprocess.TimeoutExpired(
+            command, kwargs['timeout'],
+            output=b"http://10.10.10.1:80 [301 Moved] RedirectLocation[http://box.htb/]\n")
+
+    monkeypatch.setattr(domain_manager, '_tool_available', lambda tool: True)
+    monkeypatch.setattr(domain_manager.subprocess, 'run', fake_run)
+
+    domains = manager.discover_domains_with_whatweb('10.10.10.1', [80, 443, 8080])
+
+    assert domains == ['box.htb']
+    (command, kwargs), = calls
+    assert kwargs['timeout'] == 3 * domain_manager._WHATWEB_TIMEOUT_PER_TARGET
+    assert '--read-timeout=20' in command and '--open-timeout=10' in command
+
+
+def _body_names(body):
+    return [m.group('tld') for m in domain_manager._BODY_RE.finditer(body) if m.lastgroup == 'tld']
+
+
+def test_body_names_match_the_plain_tld_pattern():
+    # A name starting where the previous one ended mid-label is still found
+    assert _body_names("sub.localhost.htb") == ['sub.local', 'host.htb']
+    assert _body_names("a.htb.localx.htb and sub.localhost.htb.local") == \
+        ['a.htb', 'localx.htb', 'sub.local', 'host.htb']
+
+
+def test_body_scan_is_linear_on_long_label_runs():
+    body = 'a' * 200000
+    start = time.perf_counter()
+    assert _body_names(body) == []
+    assert _body_names('x.htb' + body) == ['x.htb']
+    assert time.perf_counter() - start < 2